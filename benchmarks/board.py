@@ -0,0 +1,143 @@
+# Benchmark do quadro Kanban: carga do quadro inteiro (GET /tasks/board)
+# com 10 mil cartões por usuário, com e sem o índice
+# (user_id, state, position), e o custo de mover um cartão.
+#
+# Uso: python -m benchmarks.board --users 50 --cards 10000
+
+import argparse
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session
+
+from fastapi_dunossauro.models import Task, TaskState, User, table_registry
+from fastapi_dunossauro.routers.tasks import GAP, move_task, read_board
+from fastapi_dunossauro.schemas import TaskMove
+
+
+def populate(engine, users: int, cards: int):
+    rng = random.Random(42)
+    states = list(TaskState)
+    start = perf_counter()
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                {
+                    'username': f'user{i}',
+                    'email': f'user{i}@exemplo.com',
+                    'password': 'hash',
+                }
+                for i in range(users)
+            ],
+        )
+        # Os cartões dos usuários são intercalados, como em uma tabela
+        # real, em que cada quadro fica espalhado pelo arquivo.
+        rows = [
+            {
+                'title': f'Cartão {card}',
+                'description': 'x' * rng.randint(0, 200),
+                'state': rng.choice(states).name,
+                'position': card * GAP,
+                'user_id': user_id,
+            }
+            for card in range(cards)
+            for user_id in range(1, users + 1)
+        ]
+        connection.execute(insert(Task.__table__), rows)
+
+    total = users * cards
+    print(f'{total} cartões inseridos em {perf_counter() - start:.1f}s')
+
+
+def measure(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn()
+        timings.append(perf_counter() - start)
+
+    return statistics.median(timings) * 1000
+
+
+# Só a consulta, com as mesmas colunas e ordem de read_board.
+def board_query(session: Session, user_id: int):
+    return session.execute(
+        select(
+            Task.id, Task.title, Task.description, Task.state, Task.position
+        )
+        .where(Task.user_id == user_id)
+        .order_by(Task.state, Task.position)
+    ).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--cards', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f'sqlite:///{Path(directory) / "bench.db"}')
+        table_registry.metadata.create_all(engine)
+        populate(engine, args.users, args.cards)
+
+        with Session(engine) as session:
+            user = session.get(User, 1)
+
+            def load_query():
+                session.expunge_all()
+                board_query(session, user.id)
+
+            def load_board():
+                session.expunge_all()
+                read_board(session, session.get(User, 1))
+
+            indexed_query = measure(load_query, args.repeat)
+            indexed_board = measure(load_board, args.repeat)
+
+            # Move o primeiro cartão de 'todo' para o meio da coluna
+            # 'done', informando só o vizinho anterior.
+            todo, done = (
+                session.scalars(
+                    select(Task.id)
+                    .where(Task.user_id == user.id, Task.state == state)
+                    .order_by(Task.position)
+                ).all()
+                for state in (TaskState.todo, TaskState.done)
+            )
+            moves = iter(todo)
+            anchor = done[len(done) // 2]
+            move = measure(
+                lambda: move_task(
+                    next(moves),
+                    TaskMove(state=TaskState.done, after_id=anchor),
+                    session,
+                    session.get(User, 1),
+                ),
+                args.repeat,
+            )
+
+            session.execute(text('DROP INDEX ix_tasks_user_id_state_position'))
+            session.commit()
+            plain_query = measure(load_query, args.repeat)
+            plain_board = measure(load_board, args.repeat)
+
+        print(f'{"etapa":<24}{"com índice":>14}{"sem índice":>14}')
+        print(f'{"consulta do quadro":<24}{indexed_query:>11.1f} ms', end='')
+        print(f'{plain_query:>11.1f} ms')
+        print(f'{"GET /tasks/board":<24}{indexed_board:>11.1f} ms', end='')
+        print(f'{plain_board:>11.1f} ms')
+        print(f'{"mover cartão":<24}{move:>11.1f} ms')
+
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
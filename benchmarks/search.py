@@ -0,0 +1,127 @@
+# Benchmark da busca de usuários: compara o índice FTS5 trigram usado por
+# GET /users/search com um LIKE '%q%', que lê a tabela inteira.
+#
+# Colunas:
+# - busca: a consulta da rota (janela ranqueada), na primeira página e na
+#   página de offset DEEP_OFFSET, depois da janela;
+# - FTS: o mesmo índice sem rank, na ordem do id;
+# - LIKE: LIKE '%q%' LIMIT, também sem rank.
+# FTS e LIKE são a comparação equivalente (nenhum dos dois ordena); a
+# diferença entre busca e FTS é o custo da ordenação por relevância.
+#
+# Uso: python -m benchmarks.search --users 1000000
+
+import argparse
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy import create_engine, insert, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from fastapi_dunossauro.models import User, table_registry
+from fastapi_dunossauro.search import search_users_query, users_fts
+
+FIRST_NAMES = (
+    'ana', 'bruno', 'carla', 'dirce', 'eduardo', 'fernanda', 'gustavo',
+    'helena', 'igor', 'julia', 'leonardo', 'melissa', 'miguel', 'rosa',
+)  # fmt: skip
+LAST_NAMES = (
+    'alves', 'barbosa', 'costa', 'dias', 'ferreira', 'gomes', 'lima',
+    'mendes', 'oliveira', 'pereira', 'rocha', 'santos', 'silva', 'souza',
+)  # fmt: skip
+QUERIES = ('melissa', 'silva', 'a_rocha', '0004242', 'naoexiste')
+CHUNK_SIZE = 50_000
+PAGE_SIZE = 15
+DEEP_OFFSET = 5000
+
+
+def populate(engine, total: int):
+    rng = random.Random(42)
+    start = perf_counter()
+
+    with engine.begin() as connection:
+        for offset in range(0, total, CHUNK_SIZE):
+            rows = []
+            for i in range(offset, min(offset + CHUNK_SIZE, total)):
+                name = f'{rng.choice(FIRST_NAMES)}_{rng.choice(LAST_NAMES)}'
+                rows.append({
+                    'username': f'{name}{i:07d}',
+                    'email': f'{name}{i:07d}@exemplo.com',
+                    'password': 'hash',
+                })
+            connection.execute(insert(User), rows)
+
+    print(f'{total} usuários inseridos em {perf_counter() - start:.1f}s')
+
+
+def measure(session: Session, query, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        session.execute(query).all()
+        timings.append(perf_counter() - start)
+
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f'sqlite:///{Path(directory) / "bench.db"}')
+        table_registry.metadata.create_all(engine)
+        populate(engine, args.users)
+
+        print(
+            f'{"termo":<12}{"busca (ms)":>12}{"p. funda":>12}'
+            f'{"FTS (ms)":>12}{"LIKE (ms)":>12}'
+        )
+        with Session(engine) as session:
+            for q in QUERIES:
+                first = measure(
+                    session,
+                    search_users_query(session, q, 0, PAGE_SIZE),
+                    args.repeat,
+                )
+                deep = measure(
+                    session,
+                    search_users_query(session, q, DEEP_OFFSET, PAGE_SIZE),
+                    args.repeat,
+                )
+                fts = measure(
+                    session,
+                    select(User)
+                    .join(users_fts, users_fts.c.rowid == User.id)
+                    .where(literal_column('users_fts').op('MATCH')(f'"{q}"'))
+                    .limit(PAGE_SIZE),
+                    args.repeat,
+                )
+                pattern = f'%{q}%'
+                like = measure(
+                    session,
+                    select(User)
+                    .where(
+                        or_(
+                            User.username.like(pattern),
+                            User.email.like(pattern),
+                        )
+                    )
+                    .limit(PAGE_SIZE),
+                    args.repeat,
+                )
+                print(
+                    f'{q:<12}{first:>12.2f}{deep:>12.2f}'
+                    f'{fts:>12.2f}{like:>12.2f}'
+                )
+
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
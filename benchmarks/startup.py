@@ -0,0 +1,87 @@
+# Benchmark do tempo de inicialização da aplicação: mede, em processos
+# novos, o tempo de importar fastapi_dunossauro.app e o tempo até a primeira
+# resposta (lifespan + primeira requisição). Termina com código 1 se a
+# mediana passar do orçamento, então pode ser usado no CI.
+#
+# Uso: python -m benchmarks.startup --runs 10 --import-budget 1500
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Executado em um interpretador novo a cada rodada, para que nada já esteja
+# importado ou em cache.
+SCRIPT = """
+import json
+from time import perf_counter
+
+start = perf_counter()
+from fastapi_dunossauro.app import app
+imported = perf_counter()
+
+from fastapi.testclient import TestClient
+
+ready = perf_counter()
+with TestClient(app) as client:
+    client.get('/')
+    first_request = perf_counter() - ready
+
+print(json.dumps({
+    'import': (imported - start) * 1000,
+    'first_request': first_request * 1000,
+}))
+"""
+
+# Valores usados quando as variáveis não estão definidas no ambiente. Nada é
+# gravado no banco, a engine só é criada.
+DEFAULT_ENV = {
+    'DATABASE_URL': 'sqlite://',
+    'SECRET_KEY': 'benchmark',
+    'ALGORITHM': 'HS256',
+    'ACCESS_TOKEN_EXPIRE_MINUES': '30',
+}
+
+
+def run_once() -> dict:
+    result = subprocess.run(
+        [sys.executable, '-c', SCRIPT],
+        capture_output=True,
+        check=True,
+        env={**DEFAULT_ENV, **os.environ},
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--import-budget', type=float, default=1500)
+    parser.add_argument('--first-request-budget', type=float, default=200)
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+
+    failed = False
+    print(
+        f'{"etapa":<16}{"mediana (ms)":>14}{"máx (ms)":>12}{"orçamento":>12}'
+    )
+    for name, budget in (
+        ('import', args.import_budget),
+        ('first_request', args.first_request_budget),
+    ):
+        timings = [sample[name] for sample in samples]
+        median = statistics.median(timings)
+        failed = failed or median > budget
+        print(f'{name:<16}{median:>14.1f}{max(timings):>12.1f}{budget:>12.0f}')
+
+    if failed:
+        print('Tempo de inicialização acima do orçamento.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+# O access_log.py registra uma linha JSON por requisição (rota, status,
+# latência, usuário e quantidade de consultas ao banco) sem colocar I/O no
+# caminho da requisição.
+#
+# O middleware só monta um dicionário e o coloca em uma fila em memória
+# (QueueHandler). Uma thread de fundo (QueueListener) formata o JSON e
+# escreve no stdout em lotes: as linhas acumulam enquanto houver mais
+# registros na fila, até `capacity`, e são escritas de uma vez quando a fila
+# esvazia. Com pouco tráfego cada linha sai na hora; com muito, são poucas
+# escritas grandes.
+#
+# O volume é controlado por taxas de amostragem por rota
+# (ACCESS_LOG_SAMPLING), com ACCESS_LOG_RATE como padrão. Respostas 5xx são
+# sempre registradas. Cada linha leva a taxa usada (sample_rate), para que
+# as contagens possam ser reponderadas. Se a fila encher, os registros
+# novos são descartados e contados em `dropped`.
+
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import UTC, datetime
+from http import HTTPStatus
+from logging.handlers import QueueHandler, QueueListener
+from time import perf_counter
+
+from sqlalchemy import event
+
+from fastapi_dunossauro.request_context import get_request_context, route_name
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):  # noqa: PLR6301
+        data = {
+            'time': datetime.fromtimestamp(record.created, UTC).isoformat(
+                timespec='milliseconds'
+            ),
+            'level': record.levelname,
+            **getattr(record, 'access', {'message': record.getMessage()}),
+        }
+        return json.dumps(data, separators=(',', ':'))
+
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    # O prepare padrão copia o registro e formata a mensagem na thread da
+    # requisição (quase metade do custo do log). Os registros de acesso não
+    # têm args nem exceção, e o JSON é montado na thread do listener.
+    def prepare(self, record):  # noqa: PLR6301
+        return record
+
+    # O QueueHandler padrão trataria a fila cheia como erro de logging e
+    # escreveria o traceback no stderr, na thread da requisição.
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Acumula as linhas formatadas e as escreve juntas quando o lote enche ou a
+# fila de origem fica vazia.
+class BatchingStreamHandler(logging.StreamHandler):
+    def __init__(self, stream, source: queue.Queue, capacity: int = 100):
+        super().__init__(stream)
+        self.source = source
+        self.capacity = capacity
+        self.buffer = []
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+            return
+
+        if len(self.buffer) >= self.capacity or self.source.empty():
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.buffer and self.stream:
+                self.stream.write('\n'.join(self.buffer) + '\n')
+                self.buffer.clear()
+            super().flush()
+
+
+# Conta os comandos executados na requisição atual.
+def _count_query(  # noqa: PLR0913, PLR0917
+    conn, cursor, statement, parameters, context, executemany
+):
+    request_context = get_request_context()
+    if request_context is not None:
+        request_context['db_queries'] = (
+            request_context.get('db_queries', 0) + 1
+        )
+
+
+class AccessLog:
+    def __init__(self, maxsize: int = 10_000, capacity: int = 100):
+        self.rate = 1.0
+        self.rates: dict[str, float] = {}
+        self.capacity = capacity
+        self.queue = queue.Queue(maxsize)
+        self.queue_handler = DroppingQueueHandler(self.queue)
+        self.handler = None
+        self.logger = logging.getLogger('fastapi_dunossauro.access')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self._listener = None
+
+    def configure(self, rate: float, rates: dict[str, float]):
+        self.rate = rate
+        self.rates = rates
+
+    def start(self, stream=None):
+        self.handler = BatchingStreamHandler(
+            stream or sys.stdout, self.queue, self.capacity
+        )
+        self.handler.setFormatter(JSONFormatter())
+        self._listener = QueueListener(self.queue, self.handler)
+        self._listener.start()
+        self.logger.addHandler(self.queue_handler)
+
+    # Escreve os registros pendentes e encerra a thread (no desligamento).
+    def stop(self):
+        if self._listener is None:
+            return
+
+        self.logger.removeHandler(self.queue_handler)
+        self._listener.stop()
+        self._listener = None
+        self.handler.flush()
+
+    @staticmethod
+    def install(engine):
+        if not event.contains(engine, 'before_cursor_execute', _count_query):
+            event.listen(engine, 'before_cursor_execute', _count_query)
+
+    @staticmethod
+    def uninstall(engine):
+        if event.contains(engine, 'before_cursor_execute', _count_query):
+            event.remove(engine, 'before_cursor_execute', _count_query)
+
+    def sample_rate(self, route: str) -> float:
+        return self.rates.get(route, self.rate)
+
+    def log(self, data: dict):
+        self.logger.info('access', extra={'access': data})
+
+    @property
+    def dropped(self) -> int:
+        return self.queue_handler.dropped
+
+
+access_log = AccessLog()
+
+
+# Middleware ASGI puro. Fica dentro do RequestContextMiddleware, de onde lê
+# o usuário (gravado pelo get_current_user) e a contagem de consultas.
+class AccessLogMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        # Sem resposta enviada (exceção), o ServerErrorMiddleware responde
+        # 500.
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            latency = perf_counter() - start
+            route = route_name(scope)
+            rate = access_log.sample_rate(route)
+            if (
+                status >= HTTPStatus.INTERNAL_SERVER_ERROR
+                or random.random() < rate
+            ):
+                context = get_request_context() or {}
+                access_log.log({
+                    'route': route,
+                    'path': scope['path'],
+                    'status': status,
+                    'latency_ms': round(latency * 1000, 2),
+                    'user_id': context.get('user_id'),
+                    'db_queries': context.get('db_queries', 0),
+                    'sample_rate': rate,
+                })
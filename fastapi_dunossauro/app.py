@@ -1,16 +1,115 @@
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
+from starlette.concurrency import run_in_threadpool
 
-from fastapi_dunossauro.routers import auth, users
+from fastapi_dunossauro.access_log import AccessLogMiddleware, access_log
+from fastapi_dunossauro.audit import audit_log
+from fastapi_dunossauro.cache import users_cache
+from fastapi_dunossauro.database import get_engine, session_from_app
+from fastapi_dunossauro.limiter import AIMDLimiter, ConcurrencyLimitMiddleware
+from fastapi_dunossauro.profiler import ProfilerMiddleware, profiler
+from fastapi_dunossauro.purge import purger
+from fastapi_dunossauro.request_context import RequestContextMiddleware
+from fastapi_dunossauro.routers import (
+    admin,
+    auth,
+    health,
+    tasks,
+    users,
+    well_known,
+)
 from fastapi_dunossauro.schemas import Message
+from fastapi_dunossauro.security import get_key_ring, get_password_hasher
+from fastapi_dunossauro.settings import get_settings
+from fastapi_dunossauro.slow_queries import slow_query_log
+from fastapi_dunossauro.warmup import warm_up, warmup_state
+
+
+# O lifespan roda uma vez por worker, antes da primeira requisição. Os
+# objetos caros (engine, hasher argon2 e chaves JWT) são criados aqui, e não
+# no import dos módulos, então importar o pacote fica barato e a primeira
+# requisição não paga esse custo. Em seguida o aquecimento abre as conexões
+# do pool e executa as consultas quentes uma vez; o servidor só começa a
+# aceitar conexões depois que o lifespan termina essa etapa.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_engine()
+    get_password_hasher()
+    get_key_ring()
+    settings = get_settings()
+    await run_in_threadpool(warm_up, app, settings.WARMUP_CONNECTIONS)
+    # As threads do audit e do purge e o registro de consultas lentas usam a
+    # mesma engine das rotas (nos testes, a do banco de teste). O registro
+    # só começa depois do aquecimento, cujas consultas frias seriam lentas.
+    with session_from_app(app) as session:
+        engine = session.get_bind()
+    slow_query_log.threshold = settings.SLOW_QUERY_MS / 1000
+    slow_query_log.top = settings.SLOW_QUERY_TOP
+    slow_query_log.install(engine)
+    access_log.configure(
+        settings.ACCESS_LOG_RATE, settings.ACCESS_LOG_SAMPLING
+    )
+    access_log.install(engine)
+    access_log.start()
+    users_cache.backend.ttl = settings.USERS_CACHE_TTL
+    audit_log.start(engine)
+    purger.start(engine)
+    yield
+    # Ao desligar, o /health/ready deixa de responder pronto, o purge para
+    # no fim do lote atual, os eventos de auditoria pendentes são gravados e
+    # as conexões do pool são fechadas.
+    warmup_state.ready = False
+    profiler.disable()
+    await run_in_threadpool(purger.stop)
+    await run_in_threadpool(audit_log.stop)
+    slow_query_log.uninstall(engine)
+    access_log.uninstall(engine)
+    await run_in_threadpool(access_log.stop)
+    get_engine().dispose()
+
 
 # Instancia a aplicação FastAPI na variável 'app'.
-app = FastAPI(title='API - Kanban com FastAPI')
+app = FastAPI(title='API - Kanban com FastAPI', lifespan=lifespan)
+
+# Orçamentos de concorrência separados para rotas caras (argon2 e escritas),
+# para o quadro de tarefas (~200 ms por requisição) e para as baratas. A
+# soma dos limites máximos (8 + 4 + 28) fica dentro das 40 threads padrão
+# do threadpool, então o excesso é recusado com 503 ao invés de ficar na
+# fila do threadpool aumentando a latência de todas as rotas.
+expensive_limiter = AIMDLimiter(
+    initial=4, min_limit=1, max_limit=8, latency_target=0.5
+)
+board_limiter = AIMDLimiter(
+    initial=2, min_limit=1, max_limit=4, latency_target=0.5
+)
+cheap_limiter = AIMDLimiter(
+    initial=16, min_limit=4, max_limit=28, latency_target=0.1
+)
+app.add_middleware(
+    ConcurrencyLimitMiddleware,
+    expensive=expensive_limiter,
+    cheap=cheap_limiter,
+    board=board_limiter,
+)
+# O profiler fica por fora do limitador para que o tempo de espera por uma
+# vaga também apareça nas amostras.
+app.add_middleware(ProfilerMiddleware)
+# O log de acesso mede a latência vista pelo cliente, inclusive as
+# requisições recusadas pelo limitador.
+app.add_middleware(AccessLogMiddleware)
+# Adicionado por último, fica por fora dos demais e abre o contexto da
+# requisição (rota atual) antes de qualquer outro código rodar.
+app.add_middleware(RequestContextMiddleware)
 
+app.include_router(admin.router)
 app.include_router(auth.router)
+app.include_router(health.router)
+app.include_router(tasks.router)
 app.include_router(users.router)
+app.include_router(well_known.router)
 
 
 @app.get('/', response_model=Message, status_code=HTTPStatus.OK)
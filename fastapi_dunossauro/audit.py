@@ -0,0 +1,149 @@
+# O audit.py registra quem criou, alterou, excluiu ou fez login. Gravar um
+# INSERT extra dentro de cada requisição somaria uma escrita a toda
+# alteração, então as rotas apenas colocam o evento em uma fila em memória
+# (uma operação de microssegundos) e uma thread de fundo grava os eventos em
+# lote, com um único executemany a cada batch_size eventos ou a cada
+# flush_interval segundos, o que vier primeiro (write-behind).
+#
+# A fila é limitada: se o banco ficar lento demais e ela encher, os eventos
+# novos são descartados e contados em `dropped`, ao invés de a memória
+# crescer sem limite ou as requisições ficarem esperando.
+
+import queue
+import threading
+from collections import deque
+from time import monotonic, perf_counter
+
+from sqlalchemy import insert
+
+from fastapi_dunossauro.models import AuditEvent, utcnow
+
+# Marca colocada na fila pelo stop() para a thread gravar o que restou e
+# terminar.
+_STOP = object()
+
+
+class AuditLog:
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize)
+        self._thread = None
+        self._engine = None
+        self._lock = threading.Lock()
+        # Métricas.
+        self.dropped = 0
+        self.written = 0
+        self.flushes = 0
+        self._latencies = deque(maxlen=100)
+
+    def record(
+        self,
+        action: str,
+        user_id: int | None = None,
+        target_id: int | None = None,
+    ):
+        event = {
+            'action': action,
+            'user_id': user_id,
+            'target_id': target_id,
+            'created_at': utcnow(),
+        }
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def start(self, engine):
+        self._engine = engine
+        self._thread = threading.Thread(
+            target=self._run, name='audit-log', daemon=True
+        )
+        self._thread.start()
+
+    # Grava os eventos pendentes e encerra a thread (no desligamento).
+    def stop(self, timeout: float = 10):
+        if self._thread is None:
+            return
+
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            if batch:
+                self._flush(batch)
+
+        # Esvazia o que chegou enquanto o último lote era gravado.
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is not _STOP:
+                    batch.append(event)
+            if not batch:
+                return
+            self._flush(batch)
+
+    # Junta eventos até completar o lote ou vencer o intervalo.
+    def _collect(self):
+        batch = []
+        deadline = monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                event = self._queue.get(timeout=max(0, deadline - monotonic()))
+            except queue.Empty:
+                break
+            if event is _STOP:
+                return batch, True
+            batch.append(event)
+
+        return batch, False
+
+    def _flush(self, batch: list[dict]):
+        start = perf_counter()
+        try:
+            with self._engine.begin() as connection:
+                connection.execute(insert(AuditEvent), batch)
+        except Exception:
+            # Um lote que falhou é descartado, para não travar a fila.
+            with self._lock:
+                self.dropped += len(batch)
+            return
+
+        with self._lock:
+            self.written += len(batch)
+            self.flushes += 1
+            self._latencies.append(perf_counter() - start)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                'queued': self._queue.qsize(),
+                'dropped': self.dropped,
+                'written': self.written,
+                'flushes': self.flushes,
+                # Latência dos últimos 100 lotes, em milissegundos.
+                'flush_ms_p50': (
+                    latencies[len(latencies) // 2] * 1000
+                    if latencies
+                    else None
+                ),
+                'flush_ms_max': latencies[-1] * 1000 if latencies else None,
+            }
+
+
+audit_log = AuditLog()
@@ -0,0 +1,142 @@
+# O cache.py guarda as páginas já serializadas de GET /users/.
+# A chave de cada página é formada pela versão da tabela users mais os
+# parâmetros normalizados do FilterPage. Toda escrita na tabela incrementa
+# a versão, então todas as páginas antigas deixam de ser encontradas de uma
+# só vez, sem precisar percorrer ou apagar chaves.
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Protocol
+
+from pydantic import BaseModel
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes) -> None: ...
+
+    def version(self) -> int: ...
+
+    def bump(self) -> int: ...
+
+    def clear(self) -> None: ...
+
+
+# Backend em memória do processo, com descarte do item usado há mais tempo
+# (LRU) quando atinge o tamanho máximo. Páginas de versões antigas nunca
+# mais são lidas e acabam saindo do cache por esse descarte.
+#
+# A versão também é do processo: com vários workers, uma escrita só
+# invalida as páginas do worker que a recebeu. Por isso cada página expira
+# `ttl` segundos depois de gravada, o que limita por quanto tempo os outros
+# workers podem servir uma página desatualizada.
+class LRUBackend:
+    def __init__(self, maxsize: int = 256, ttl: float = 5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._version = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._items[key] = (monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> int:
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+# Interface mínima de um armazenamento compartilhado entre workers
+# (por exemplo, Redis ou Memcached).
+class SharedStore(Protocol):
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    def incr(self, key: str) -> int: ...
+
+
+# Backend que usa um SharedStore: a versão fica no próprio store, então uma
+# escrita em qualquer worker invalida as páginas de todos eles.
+class SharedStoreBackend:
+    def __init__(
+        self, store: SharedStore, prefix: str = 'users', ttl: int = 300
+    ):
+        self.store = store
+        self.prefix = prefix
+        self.ttl = ttl
+        self._version_key = f'{prefix}:version'
+
+    def get(self, key: str) -> bytes | None:
+        return self.store.get(f'{self.prefix}:page:{key}')
+
+    def set(self, key: str, value: bytes) -> None:
+        self.store.set(f'{self.prefix}:page:{key}', value, self.ttl)
+
+    def version(self) -> int:
+        return int(self.store.get(self._version_key) or 0)
+
+    def bump(self) -> int:
+        return self.store.incr(self._version_key)
+
+    def clear(self) -> None:
+        # Trocar a versão já torna todas as páginas inacessíveis, e o TTL
+        # cuida de removê-las do store.
+        self.bump()
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    # A versão é lida antes da consulta ao banco. Se uma escrita acontecer
+    # no meio do caminho, a página fica gravada sob a versão antiga e
+    # nunca será servida.
+    def key(self, filter_page: BaseModel) -> str:
+        return f'{self.backend.version()}:{filter_page.model_dump_json()}'
+
+    def get(self, key: str) -> bytes | None:
+        return self.backend.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.backend.set(key, value)
+
+    def invalidate(self) -> None:
+        self.backend.bump()
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+# Com um único worker o LRUBackend é exato: toda escrita invalida as
+# páginas na hora. Com vários workers, as páginas dos outros workers podem
+# ficar desatualizadas por até USERS_CACHE_TTL segundos (aplicado no
+# lifespan); para invalidação imediata entre workers, troque o backend por
+# um SharedStoreBackend.
+users_cache = ResponseCache(LRUBackend())
@@ -1,11 +1,39 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+from functools import lru_cache
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
-from fastapi_dunossauro.settings import Settings
+from fastapi_dunossauro.settings import get_settings
+
 
-engine = create_engine(Settings().DATABASE_URL)
+# A engine é criada na primeira chamada (no lifespan da aplicação) e não no
+# import do módulo, o que deixa o import mais leve e não exige as variáveis
+# de ambiente só para importar o pacote.
+@lru_cache
+def get_engine():
+    return create_engine(get_settings().DATABASE_URL)
 
 
 def get_session():
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
+
+
+# Abre uma sessão fora da injeção de dependências de uma rota (em um route
+# handler, no lifespan ou em tarefas de fundo), respeitando as sobrescritas
+# de get_session feitas em app.dependency_overrides, como nos testes.
+@contextmanager
+def session_from_app(app):
+    provider = app.dependency_overrides.get(get_session, get_session)
+    result = provider()
+
+    if not isinstance(result, Generator):
+        yield result
+        return
+
+    try:
+        yield next(result)
+    finally:
+        result.close()
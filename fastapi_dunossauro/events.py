@@ -0,0 +1,193 @@
+# O events.py distribui as alterações de usuários (criação, atualização e
+# exclusão) para os clientes conectados em GET /users/events, via
+# Server-Sent Events. Assim os clientes recebem as mudanças quando elas
+# acontecem, ao invés de consultar GET /users/ repetidamente.
+#
+# O LocalBroker faz o fan-out dentro do processo: cada assinante tem uma
+# fila limitada e, se não consumir os eventos a tempo e a fila encher, é
+# desconectado ao invés de segurar memória ou atrasar os demais. Os
+# eventos recentes ficam em um buffer circular, então um cliente que
+# reconecta com o header Last-Event-ID recebe o que perdeu.
+#
+# Com vários workers, o SharedBroker publica os eventos em um barramento
+# compartilhado (Redis pub/sub, por exemplo) e cada worker os entrega aos
+# seus assinantes pelo LocalBroker.
+
+import asyncio
+import json
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict
+
+
+# Marca colocada na fila de um assinante lento para encerrar o stream.
+_DROPPED = object()
+
+
+class Subscription:
+    def __init__(self, loop, backlog: list[Event], maxsize: int):
+        self.loop = loop
+        self.backlog = backlog
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    # Executado no event loop do assinante.
+    def _offer(self, event: Event):
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Descarta o que estava pendente e encerra o stream; o cliente
+            # reconecta com Last-Event-ID e recupera pelo buffer circular.
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_DROPPED)
+
+    # Produz o backlog e depois os eventos da fila. Se nada chegar em
+    # `keepalive` segundos, produz None, para a rota enviar um comentário
+    # que mantém a conexão aberta em proxies. Termina quando o assinante é
+    # descartado por lentidão.
+    async def events(self, keepalive: float | None = None):
+        for event in self.backlog:
+            yield event
+        while True:
+            try:
+                event = await asyncio.wait_for(self.queue.get(), keepalive)
+            except TimeoutError:
+                yield None
+                continue
+            if event is _DROPPED:
+                return
+            yield event
+
+
+class Broker(Protocol):
+    def publish(self, event_type: str, data: dict) -> None: ...
+
+    def subscribe(self, last_event_id: int | None = None) -> Subscription: ...
+
+    def unsubscribe(self, subscription: Subscription) -> None: ...
+
+
+class LocalBroker:
+    def __init__(self, history: int = 1000, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._history: deque[Event] = deque(maxlen=history)
+        self._subscribers: set[Subscription] = set()
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    # Pode ser chamado de qualquer thread (as rotas síncronas rodam no
+    # threadpool): a entrega é agendada no event loop de cada assinante.
+    def publish(self, event_type: str, data: dict) -> None:
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, event_type, data)
+        self.dispatch(event)
+
+    def dispatch(self, event: Event) -> None:
+        with self._lock:
+            self._last_id = max(self._last_id, event.id)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription._offer, event
+                )
+            except RuntimeError:
+                # Event loop já encerrado.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, last_event_id: int | None = None) -> Subscription:
+        loop = asyncio.get_running_loop()
+        # O backlog e o registro acontecem sob o mesmo lock do publish, então
+        # nenhum evento é perdido nem entregue duas vezes.
+        with self._lock:
+            backlog = []
+            if last_event_id is not None:
+                oldest = self._history[0].id if self._history else 1
+                # O cliente perdeu mais eventos do que o buffer guarda (ou o
+                # id é de antes de um reinício): ele é avisado para
+                # recarregar os dados.
+                if not oldest - 1 <= last_event_id <= self._last_id:
+                    backlog.append(Event(self._last_id, 'reset', {}))
+                else:
+                    backlog.extend(
+                        event
+                        for event in self._history
+                        if event.id > last_event_id
+                    )
+            subscription = Subscription(loop, backlog, self.queue_size)
+            self._subscribers.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+# Barramento entre workers. O incr gera ids globais, para que o
+# Last-Event-ID valha em qualquer worker, e o callback do subscribe é
+# chamado para cada mensagem publicada por qualquer worker (inclusive ele
+# mesmo), em uma thread do barramento.
+class SharedBus(Protocol):
+    def incr(self, key: str) -> int: ...
+
+    def publish(self, channel: str, message: str) -> None: ...
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]): ...
+
+
+class SharedBroker:
+    def __init__(self, bus: SharedBus, channel: str = 'users', local=None):
+        self.bus = bus
+        self.channel = channel
+        self.local = local or LocalBroker()
+        bus.subscribe(channel, self._receive)
+
+    def publish(self, event_type: str, data: dict) -> None:
+        event_id = self.bus.incr(f'{self.channel}:event_id')
+        self.bus.publish(
+            self.channel,
+            json.dumps({'id': event_id, 'type': event_type, 'data': data}),
+        )
+
+    def _receive(self, message: str):
+        self.local.dispatch(Event(**json.loads(message)))
+
+    def subscribe(self, last_event_id: int | None = None) -> Subscription:
+        return self.local.subscribe(last_event_id)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.local.unsubscribe(subscription)
+
+
+user_events = LocalBroker()
+
+
+# Dependência das rotas: trocar o broker (por um SharedBroker, ou por um
+# falso nos testes) é feito em app.dependency_overrides.
+def get_broker() -> Broker:
+    return user_events
+
+
+# Formato de um evento no protocolo Server-Sent Events.
+def format_sse(event: Event) -> str:
+    return (
+        f'id: {event.id}\nevent: {event.type}\n'
+        f'data: {json.dumps(event.data)}\n\n'
+    )
@@ -0,0 +1,195 @@
+# O idempotency.py implementa o header Idempotency-Key nas rotas que alteram
+# dados. Quando um cliente repete uma requisição (por exemplo, após um
+# timeout) com a mesma chave, a resposta gravada na primeira execução é
+# devolvida sem executar a rota de novo, evitando outro hash argon2 e
+# outra escrita no banco de dados.
+#
+# As respostas ficam em um cache em memória com tamanho e validade
+# limitados e também na tabela idempotency_keys, para sobreviverem a
+# reinícios e serem vistas por outros workers. Requisições duplicadas que
+# chegam ao mesmo tempo aguardam a primeira terminar ao invés de repetir
+# o trabalho.
+
+import asyncio
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from hashlib import sha256
+from http import HTTPStatus
+from time import monotonic
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import delete
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_dunossauro.database import session_from_app
+from fastapi_dunossauro.models import IdempotencyKey, utcnow
+
+MUTATING_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+# Cache em memória com validade (TTL) e tamanho máximo. Ao passar do tamanho,
+# as entradas mais antigas são descartadas primeiro.
+class TTLStore:
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._items: OrderedDict[str, tuple[float, IdempotencyKey]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> IdempotencyKey | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires, record = item
+            if expires <= monotonic():
+                del self._items[key]
+                return None
+            return record
+
+    def set(self, key: str, record: IdempotencyKey):
+        with self._lock:
+            self._items[key] = (monotonic() + self.ttl, record)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class IdempotencyStore:
+    def __init__(
+        self, ttl: timedelta = timedelta(hours=24), maxsize: int = 1024
+    ):
+        self.ttl = ttl
+        self.local = TTLStore(ttl.total_seconds(), maxsize)
+        # Chaves em execução, para as duplicatas concorrentes aguardarem.
+        self.in_flight: dict[str, asyncio.Event] = {}
+
+    # A chave é isolada por método, caminho e credencial, assim a mesma
+    # Idempotency-Key enviada por clientes diferentes não se mistura.
+    @staticmethod
+    def scope(request: Request, key: str) -> str:
+        parts = (
+            request.method,
+            request.url.path,
+            request.headers.get('Authorization', ''),
+            key,
+        )
+        return sha256('\n'.join(parts).encode()).hexdigest()
+
+    def get(self, app, key: str) -> IdempotencyKey | None:
+        record = self.local.get(key)
+        if record is not None:
+            return record
+
+        with session_from_app(app) as session:
+            record = session.get(IdempotencyKey, key)
+            if record is None or record.expires_at <= utcnow():
+                return None
+            session.expunge(record)
+
+        self.local.set(key, record)
+        return record
+
+    def save(self, app, key: str, record: IdempotencyKey):
+        self.local.set(key, record)
+
+        with session_from_app(app) as session:
+            # Aproveita a escrita para remover as chaves já expiradas.
+            session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.expires_at <= utcnow()
+                )
+            )
+            session.merge(record)
+            session.commit()
+
+    def clear(self):
+        self.local.clear()
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _replay(record: IdempotencyKey, fingerprint: str) -> Response:
+    # A mesma chave com um corpo diferente indica erro do cliente.
+    if record.fingerprint != fingerprint:
+        return JSONResponse(
+            {'detail': 'Idempotency-Key já utilizada com outra requisição.'},
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+
+    return Response(
+        content=record.body,
+        status_code=record.status_code,
+        media_type=record.media_type,
+        headers={'Idempotent-Replayed': 'true'},
+    )
+
+
+# Route class usada pelos routers com rotas que alteram dados. Requisições
+# sem o header Idempotency-Key seguem o fluxo normal do FastAPI.
+class IdempotentRoute(APIRoute):
+    def get_route_handler(self):
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            key = request.headers.get('Idempotency-Key')
+            if key is None or request.method not in MUTATING_METHODS:
+                return await original_handler(request)
+
+            store = idempotency_store
+            scoped_key = store.scope(request, key)
+            fingerprint = sha256(await request.body()).hexdigest()
+
+            # Duplicata concorrente: espera a requisição em andamento
+            # terminar. Depois disso a resposta já estará gravada.
+            while (event := store.in_flight.get(scoped_key)) is not None:
+                await event.wait()
+
+            # A chave é reservada antes de qualquer await, então nenhuma
+            # outra requisição com a mesma chave executa a rota ao mesmo
+            # tempo.
+            event = store.in_flight[scoped_key] = asyncio.Event()
+            try:
+                record = await run_in_threadpool(
+                    store.get, request.app, scoped_key
+                )
+                if record is not None:
+                    return _replay(record, fingerprint)
+
+                response = await original_handler(request)
+
+                # Erros do servidor não são gravados, para que uma nova
+                # tentativa execute a rota de novo. Exceções (como os
+                # HTTPException de conflito) também não chegam aqui.
+                if (
+                    response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR
+                    and hasattr(response, 'body')
+                ):
+                    record = IdempotencyKey(
+                        key=scoped_key,
+                        fingerprint=fingerprint,
+                        status_code=response.status_code,
+                        media_type=response.media_type or 'application/json',
+                        body=bytes(response.body),
+                        expires_at=utcnow() + store.ttl,
+                    )
+                    await run_in_threadpool(
+                        store.save, request.app, scoped_key, record
+                    )
+            finally:
+                del store.in_flight[scoped_key]
+                event.set()
+
+            return response
+
+        return handler
@@ -0,0 +1,102 @@
+# O keys.py reúne as chaves usadas para assinar e verificar os tokens JWT.
+# Com um algoritmo simétrico (HS256, por exemplo) a mesma SECRET_KEY assina
+# e verifica, então quem quiser validar um token precisa conhecer o segredo.
+# Com um algoritmo assimétrico (EdDSA ou RS256) a API assina com a chave
+# privada e publica as chaves públicas em /.well-known/jwks.json, assim os
+# outros serviços verificam os tokens localmente, sem chamar esta API.
+#
+# Para rotação de chaves, cada chave tem um identificador (kid) que vai no
+# header do token. Só a chave ativa assina, mas todas continuam verificando
+# até serem removidas, então tokens antigos seguem válidos até expirarem.
+
+from pathlib import Path
+
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from jwt import PyJWKClient, decode, get_unverified_header
+from jwt.algorithms import get_default_algorithms
+from jwt.exceptions import DecodeError
+
+SYMMETRIC_ALGORITHMS = {'HS256', 'HS384', 'HS512'}
+
+
+class KeyRing:
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str | None = None,
+        private_keys: dict | None = None,
+        active_kid: str | None = None,
+    ):
+        self.algorithm = algorithm
+        self.secret_key = secret_key
+        self.private_keys = private_keys or {}
+        self.active_kid = active_kid
+        # As chaves públicas são derivadas uma única vez e ficam indexadas
+        # pelo kid para a verificação ser apenas uma consulta ao dicionário.
+        self.public_keys = {
+            kid: key.public_key() for kid, key in self.private_keys.items()
+        }
+
+        if self.asymmetric and self.active_kid not in self.private_keys:
+            raise ValueError(f'Chave ativa {active_kid!r} não encontrada.')
+
+    @property
+    def asymmetric(self) -> bool:
+        return self.algorithm not in SYMMETRIC_ALGORITHMS
+
+    # Carrega as chaves privadas a partir de um diretório com arquivos PEM,
+    # um por chave, em que o nome do arquivo (sem o .pem) é o kid.
+    @classmethod
+    def from_settings(cls, settings):
+        if settings.ALGORITHM in SYMMETRIC_ALGORITHMS:
+            return cls(settings.ALGORITHM, secret_key=settings.SECRET_KEY)
+
+        private_keys = {
+            path.stem: load_pem_private_key(path.read_bytes(), password=None)
+            for path in sorted(Path(settings.JWT_KEYS_DIR).glob('*.pem'))
+        }
+        return cls(
+            settings.ALGORITHM,
+            private_keys=private_keys,
+            active_kid=settings.JWT_ACTIVE_KID,
+        )
+
+    # Retorna a chave de assinatura e os headers extras do token.
+    def signing_key(self):
+        if not self.asymmetric:
+            return self.secret_key, None
+
+        return self.private_keys[self.active_kid], {'kid': self.active_kid}
+
+    # Escolhe a chave de verificação pelo kid do header do token.
+    def verification_key(self, token: str):
+        if not self.asymmetric:
+            return self.secret_key
+
+        kid = get_unverified_header(token).get('kid')
+        if kid not in self.public_keys:
+            raise DecodeError('Token assinado com uma chave desconhecida.')
+
+        return self.public_keys[kid]
+
+    def jwks(self) -> dict:
+        algorithm = get_default_algorithms()[self.algorithm]
+        keys = []
+        for kid, public_key in self.public_keys.items():
+            jwk = algorithm.to_jwk(public_key, as_dict=True)
+            jwk.update({'kid': kid, 'use': 'sig', 'alg': self.algorithm})
+            keys.append(jwk)
+
+        return {'keys': keys}
+
+
+# Para os serviços que confiam nos tokens desta API: o PyJWKClient baixa o
+# JWKS e guarda as chaves em cache pelo kid, então só volta a buscar o JWKS
+# quando aparece um kid novo (depois de uma rotação) ou o cache expira.
+def jwks_verifier(jwks_url: str, lifespan: int = 300) -> PyJWKClient:
+    return PyJWKClient(jwks_url, cache_keys=True, lifespan=lifespan)
+
+
+def decode_with_jwks(verifier: PyJWKClient, token: str, algorithms: list):
+    signing_key = verifier.get_signing_key_from_jwt(token)
+    return decode(token, signing_key.key, algorithms=algorithms)
@@ -0,0 +1,151 @@
+# O limiter.py implementa um limitador de concorrência adaptativo.
+# Cada orçamento (budget) controla quantas requisições podem estar em
+# execução ao mesmo tempo. O limite se ajusta pela latência observada no
+# esquema AIMD (Additive Increase, Multiplicative Decrease): enquanto as
+# respostas ficam abaixo da latência alvo o limite cresce devagar, e quando
+# a latência passa do alvo (ou acontece um erro) o limite cai rapidamente.
+# O que passar do limite é recusado na hora com 503, antes de ocupar o
+# threadpool do FastAPI, assim o serviço degrada aos poucos ao invés de
+# travar todas as rotas juntas.
+
+import re
+import threading
+from http import HTTPStatus
+from time import perf_counter
+
+from fastapi.responses import JSONResponse
+
+
+class AIMDLimiter:
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        backoff: float = 0.9,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target  # Em segundos.
+        self.backoff = backoff
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.shed = 0  # Quantas requisições foram recusadas.
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float, failed: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            if failed or latency > self.latency_target:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            else:
+                # Somar 1/limit a cada resposta equivale a somar 1 ao limite
+                # a cada "janela" de requisições bem-sucedidas.
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+# Rotas caras: fazem hash/verificação argon2 ou escrevem no banco.
+EXPENSIVE_ROUTES = (
+    ('POST', re.compile(r'^/auth/token/?$')),
+    ('POST', re.compile(r'^/users/?$')),
+    ('PUT', re.compile(r'^/users/\d+/?$')),
+    ('POST', re.compile(r'^/tasks/?$')),
+    ('PATCH', re.compile(r'^/tasks/\d+(/move)?/?$')),
+    ('DELETE', re.compile(r'^/tasks/\d+/?$')),
+)
+
+# O quadro de tarefas é uma leitura, mas bem mais lenta que as outras
+# (monta as colunas inteiras do usuário). No orçamento das rotas baratas a
+# sua latência passaria sempre do alvo e derrubaria o limite de todas elas,
+# então ele tem um orçamento próprio.
+BOARD_ROUTES = (('GET', re.compile(r'^/tasks/board/?$')),)
+
+
+# Streams de longa duração (SSE) ficam fora dos limites: uma conexão aberta
+# por horas ocuparia uma vaga o tempo todo e a sua "latência" faria o AIMD
+# reduzir o limite das demais rotas.
+STREAMING_ROUTES = (('GET', re.compile(r'^/users/events/?$')),)
+
+
+def _matches(routes, method: str, path: str) -> bool:
+    return any(
+        method == route_method and pattern.match(path)
+        for route_method, pattern in routes
+    )
+
+
+def is_streaming(method: str, path: str) -> bool:
+    return _matches(STREAMING_ROUTES, method, path)
+
+
+def is_expensive(method: str, path: str) -> bool:
+    return _matches(EXPENSIVE_ROUTES, method, path)
+
+
+def is_board(method: str, path: str) -> bool:
+    return _matches(BOARD_ROUTES, method, path)
+
+
+# Middleware ASGI puro: não cria objetos Request/Response para as
+# requisições aceitas, apenas mede o tempo até o fim da resposta.
+class ConcurrencyLimitMiddleware:
+    def __init__(
+        self,
+        app,
+        expensive: AIMDLimiter,
+        cheap: AIMDLimiter,
+        board: AIMDLimiter,
+    ):
+        self.app = app
+        self.expensive = expensive
+        self.cheap = cheap
+        self.board = board
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or is_streaming(
+            scope['method'], scope['path']
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if is_expensive(scope['method'], scope['path']):
+            limiter = self.expensive
+        elif is_board(scope['method'], scope['path']):
+            limiter = self.board
+        else:
+            limiter = self.cheap
+
+        if not limiter.try_acquire():
+            response = JSONResponse(
+                {'detail': 'Serviço sobrecarregado, tente novamente.'},
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                headers={'Retry-After': '1'},
+            )
+            await response(scope, receive, send)
+            return
+
+        failed = False
+
+        async def send_wrapper(message):
+            nonlocal failed
+            if message['type'] == 'http.response.start':
+                failed = message['status'] >= HTTPStatus.INTERNAL_SERVER_ERROR
+            await send(message)
+
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            limiter.release(perf_counter() - start, failed)
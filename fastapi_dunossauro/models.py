@@ -1,9 +1,10 @@
 # No models.py definimos os modelos de dados que definem a estrutura de como
 # os dados serão armazenados no banco de dados.
 
-from datetime import datetime
+from datetime import UTC, datetime
+from enum import Enum
 
-from sqlalchemy import func
+from sqlalchemy import ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_as_dataclass, mapped_column, registry
 
 table_registry = registry()
@@ -11,6 +12,12 @@ table_registry = registry()
 # banco de dados.
 
 
+# As colunas de data são gravadas sem fuso horário, sempre em UTC. Os
+# módulos que gravam ou comparam datas com o banco usam este "agora".
+def utcnow() -> datetime:
+    return datetime.now(tz=UTC).replace(tzinfo=None)
+
+
 @mapped_as_dataclass(table_registry)
 class User:
     __tablename__ = 'users'
@@ -26,9 +33,121 @@ class User:
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+    # Exclusão lógica: o usuário excluído continua na tabela, com a data da
+    # exclusão, até o purge.py removê-lo de fato em segundo plano.
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        init=False, default=None
+    )
 
 
 # Mapped referencia o atributo Python (e seu tipo) que será mapeado para uma
 # coluna específica em uma tabela do banco de dados.
 # Já a função mapped_column define propriedades daquela coluna, tanto a nível
 # do Python, como a nível de tabela no banco de dados.
+
+# Os e-mails são gravados em minúsculas e este índice único sobre
+# lower(email) garante que 'Melissa@Test.com' e 'melissa@test.com' nunca
+# existam ao mesmo tempo, mesmo que algum registro seja gravado sem passar
+# pela API.
+Index('ix_users_email_lower', func.lower(User.email), unique=True)
+
+# Índices parciais: as ordenações de read_users só consideram os usuários
+# ativos (deleted_at IS NULL), então os índices de created_at e updated_at
+# só guardam essas linhas. Já o de deleted_at guarda apenas os excluídos,
+# que são as linhas procuradas pelo purge.
+_active = User.deleted_at.is_(None)
+_deleted = User.deleted_at.is_not(None)
+Index(
+    'ix_users_created_at',
+    User.created_at,
+    sqlite_where=_active,
+    postgresql_where=_active,
+)
+Index(
+    'ix_users_updated_at',
+    User.updated_at,
+    sqlite_where=_active,
+    postgresql_where=_active,
+)
+Index(
+    'ix_users_deleted_at',
+    User.deleted_at,
+    sqlite_where=_deleted,
+    postgresql_where=_deleted,
+)
+
+
+# Tokens revogados (logout) antes de expirarem. O jti é o identificador único
+# do token e expires_at permite descartar a revogação quando o próprio token
+# já teria expirado.
+@mapped_as_dataclass(table_registry)
+class RevokedToken:
+    __tablename__ = 'revoked_tokens'
+
+    jti: Mapped[str] = mapped_column(primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+
+
+# Respostas guardadas para requisições com o header Idempotency-Key. Uma
+# nova tentativa com a mesma chave recebe a resposta gravada, sem executar
+# a rota de novo. O fingerprint identifica o corpo da requisição original.
+@mapped_as_dataclass(table_registry)
+class IdempotencyKey:
+    __tablename__ = 'idempotency_keys'
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    fingerprint: Mapped[str]
+    status_code: Mapped[int]
+    media_type: Mapped[str]
+    body: Mapped[bytes]
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+
+
+# Registro de auditoria: quem fez o quê e quando. Não há chave estrangeira
+# para users, já que os eventos precisam continuar existindo depois que o
+# usuário é excluído. Os eventos são gravados em lote pelo audit.py.
+@mapped_as_dataclass(table_registry)
+class AuditEvent:
+    __tablename__ = 'audit_events'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    action: Mapped[str]
+    user_id: Mapped[int | None] = mapped_column(index=True)
+    target_id: Mapped[int | None]
+    created_at: Mapped[datetime] = mapped_column(index=True)
+
+
+# Colunas do quadro Kanban.
+class TaskState(str, Enum):
+    todo = 'todo'
+    doing = 'doing'
+    done = 'done'
+
+
+# Cartão do quadro Kanban. A ordem dentro de cada coluna é dada por
+# position, um float: mover um cartão grava nele uma posição entre as dos
+# vizinhos, então só uma linha é alterada, sem renumerar a coluna inteira.
+@mapped_as_dataclass(table_registry)
+class Task:
+    __tablename__ = 'tasks'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    title: Mapped[str]
+    description: Mapped[str]
+    state: Mapped[TaskState]
+    position: Mapped[float]
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
+# O quadro de um usuário é lido em uma única consulta, já na ordem
+# (state, position), direto deste índice, sem ordenação em memória. O
+# mesmo índice atende a busca dos vizinhos ao mover um cartão.
+Index(
+    'ix_tasks_user_id_state_position', Task.user_id, Task.state, Task.position
+)
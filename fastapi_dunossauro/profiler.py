@@ -0,0 +1,226 @@
+# O profiler.py é um profiler por amostragem para investigar um worker
+# lento em produção (onde vai o tempo do create_user, do login ou da
+# serialização do UserList), ligado e desligado pelas rotas /admin.
+#
+# Desligado, ele não custa nada: não há thread nem hooks de profiling, e o
+# middleware só confere um atributo antes de repassar a requisição. Ligado,
+# uma fração `rate` das requisições é amostrada. Enquanto houver alguma
+# amostrada em andamento, uma thread lê a pilha de todas as threads com
+# sys._current_frames() a cada `interval` segundos e conta as pilhas por
+# rota, no formato "collapsed stack" aceito pelo flamegraph.pl e pelo
+# speedscope.
+#
+# A pilha de cada thread é atribuída assim:
+# - no event loop, pelo frame do middleware da requisição amostrada que
+#   estiver na pilha (dependências assíncronas e serialização do JSON);
+# - no threadpool, em que rodam as rotas e dependências síncronas, pela
+#   função da rota presente na pilha. Partes sem a função da rota na pilha
+#   (get_current_user, validação do response_model) vão para a rota
+#   amostrada em andamento, ou para '<threadpool>' se houver mais de uma.
+# Requisições não amostradas da mesma rota que rodem ao mesmo tempo também
+# entram nas amostras do threadpool: o resultado é estatístico.
+
+import random
+import sys
+import threading
+from collections import Counter
+
+from fastapi_dunossauro.limiter import is_streaming
+from fastapi_dunossauro.request_context import route_name
+
+THREADPOOL = '<threadpool>'
+
+
+def _label(frame) -> str:
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}:{frame.f_code.co_qualname}'
+
+
+# Frame do laço das threads do threadpool do anyio: o que está acima dele
+# na pilha é a tarefa que a thread executa.
+def _is_worker_loop(frame) -> bool:
+    code = frame.f_code
+    return code.co_qualname == 'WorkerThread.run' and (
+        'anyio' in code.co_filename
+    )
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, max_stacks: int = 10_000):
+        self.interval = interval  # Em segundos.
+        self.max_stacks = max_stacks
+        self.enabled = False
+        self.rate = 0.0
+        self.requests = 0  # Requisições amostradas.
+        self.samples = 0
+        self.dropped = 0  # Amostras descartadas por max_stacks.
+        self._stacks = Counter()
+        self._endpoints = {}
+        self._in_flight = {}  # Frame do middleware -> scope.
+        self._busy = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # routes: as rotas da aplicação (app.routes), para reconhecer a função
+    # de cada rota nas pilhas do threadpool.
+    def enable(self, rate: float, routes=(), interval: float | None = None):
+        self._endpoints = {
+            route.endpoint.__code__: f'{method} {route.path}'
+            for route in routes
+            if hasattr(getattr(route, 'endpoint', None), '__code__')
+            for method in sorted(getattr(route, 'methods', None) or ())
+        }
+        self.rate = rate
+        if interval is not None:
+            self.interval = interval
+        self.enabled = True
+
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='profiler', daemon=True
+            )
+            self._thread.start()
+
+    # Desliga a amostragem; as pilhas coletadas continuam disponíveis.
+    def disable(self, timeout: float = 5):
+        self.enabled = False
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._busy.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._busy.clear()
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self.requests = self.samples = self.dropped = 0
+
+    def begin(self, frame, scope):
+        with self._lock:
+            self.requests += 1
+            self._in_flight[frame] = scope
+            self._busy.set()
+
+    def end(self, frame):
+        with self._lock:
+            self._in_flight.pop(frame, None)
+            if not self._in_flight:
+                self._busy.clear()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Dorme enquanto não houver requisição amostrada em andamento.
+            if not self._busy.wait(1):
+                continue
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def sample(self):
+        frames = sys._current_frames()
+        with self._lock:
+            in_flight = dict(self._in_flight)
+        routes = {route_name(scope) for scope in in_flight.values()}
+        fallback = routes.pop() if len(routes) == 1 else THREADPOOL
+
+        stacks = []
+        for ident, top in frames.items():
+            if ident == threading.get_ident():
+                continue
+            stack = []
+            frame = top
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            stack.reverse()  # Do frame mais externo para o mais interno.
+            key = self._attribute(stack, in_flight, fallback)
+            if key is not None:
+                stacks.append(key)
+
+        with self._lock:
+            for key in stacks:
+                if key in self._stacks or len(self._stacks) < self.max_stacks:
+                    self._stacks[key] += 1
+                    self.samples += 1
+                else:
+                    self.dropped += 1
+
+    def _attribute(self, stack, in_flight, fallback) -> tuple | None:
+        for index, frame in enumerate(stack):
+            if frame in in_flight:
+                route = route_name(in_flight[frame])
+                return (route, *map(_label, stack[index + 1 :]))
+
+            if _is_worker_loop(frame):
+                task = stack[index + 1 :]
+                # Thread ociosa, esperando na fila do threadpool.
+                if not task or task[0].f_globals.get('__name__') == 'queue':
+                    return None
+                route = next(
+                    (
+                        self._endpoints[f.f_code]
+                        for f in task
+                        if f.f_code in self._endpoints
+                    ),
+                    fallback,
+                )
+                return (route, *map(_label, task))
+
+        # Outras threads (audit, purge) e requisições não amostradas.
+        return None
+
+    # Pilhas no formato collapsed: 'rota;frame;frame;... contagem'. Com
+    # `route`, só as pilhas daquela rota (ex.: 'POST /users/').
+    def collapsed(self, route: str | None = None) -> str:
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+
+        return ''.join(
+            f'{";".join(key)} {count}\n'
+            for key, count in stacks
+            if route is None or key[0] == route
+        )
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'rate': self.rate,
+                'interval_ms': self.interval * 1000,
+                'requests': self.requests,
+                'samples': self.samples,
+                'dropped': self.dropped,
+            }
+
+
+profiler = SamplingProfiler()
+
+
+# Middleware ASGI puro. O frame desta chamada fica na pilha do event loop
+# enquanto a requisição roda nele, e é por ele que as amostras do event
+# loop são atribuídas à requisição. Os streams (SSE) não são amostrados,
+# porque manteriam a amostragem ativa enquanto a conexão durasse.
+class ProfilerMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not profiler.enabled
+            or scope['type'] != 'http'
+            or random.random() >= profiler.rate
+            or is_streaming(scope['method'], scope['path'])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        frame = sys._getframe()
+        profiler.begin(frame, scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.end(frame)
@@ -0,0 +1,126 @@
+# O purge.py remove de fato os usuários excluídos logicamente (deleted_at
+# preenchido). Apagar um usuário e as linhas ligadas a ele dentro da
+# requisição seria uma exclusão em cascata segurando locks, então a rota
+# só marca deleted_at e uma thread de fundo faz a remoção depois.
+#
+# A remoção é feita em lotes pequenos, cada um na sua própria transação
+# curta, com uma pausa entre os lotes. Assim o purge nunca segura o banco
+# por muito tempo e o tráfego das rotas continua passando entre os lotes.
+
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from fastapi_dunossauro.models import Task, User, utcnow
+
+
+# Remove um lote de até `batch_size` cartões dos usuários excluídos antes de
+# `cutoff` e retorna quantos foram removidos. Um usuário pode ter milhares
+# de cartões, então eles são apagados em lotes próprios, antes dos
+# usuários. A consulta usa o índice (user_id, state, position).
+def purge_tasks_batch(connection, cutoff: datetime, batch_size: int) -> int:
+    ids = (
+        select(Task.id)
+        .join(User, User.id == Task.user_id)
+        .where(User.deleted_at.is_not(None), User.deleted_at <= cutoff)
+        .limit(batch_size)
+    )
+    result = connection.execute(delete(Task).where(Task.id.in_(ids)))
+
+    return result.rowcount
+
+
+# Remove um lote de usuários excluídos antes de `cutoff` e retorna quantos
+# foram removidos. A consulta usa o índice parcial ix_users_deleted_at, que
+# só contém os usuários excluídos. Usuários que ainda tenham cartões ficam
+# para depois do purge_tasks_batch.
+def purge_batch(connection, cutoff: datetime, batch_size: int) -> int:
+    ids = connection.scalars(
+        select(User.id)
+        .where(
+            User.deleted_at.is_not(None),
+            User.deleted_at <= cutoff,
+            ~select(Task.id).where(Task.user_id == User.id).exists(),
+        )
+        .order_by(User.deleted_at)
+        .limit(batch_size)
+    ).all()
+    if ids:
+        connection.execute(delete(User).where(User.id.in_(ids)))
+
+    return len(ids)
+
+
+class Purger:
+    def __init__(
+        self,
+        retention: timedelta = timedelta(0),
+        batch_size: int = 100,
+        pause: float = 0.1,
+        interval: float = 60,
+        task_batch_size: int = 1000,
+    ):
+        # retention: quanto tempo o usuário excluído fica na tabela antes do
+        # purge (uma janela para desfazer a exclusão, por exemplo).
+        self.retention = retention
+        self.batch_size = batch_size
+        self.task_batch_size = task_batch_size
+        self.pause = pause
+        self.interval = interval
+        self.purged = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Executa lotes até não sobrar nenhum usuário a remover: primeiro os
+    # cartões deles, depois os próprios usuários.
+    def run_once(self, engine) -> int:
+        cutoff = utcnow() - self.retention
+        self._drain(engine, purge_tasks_batch, cutoff, self.task_batch_size)
+        total = self._drain(engine, purge_batch, cutoff, self.batch_size)
+        self.purged += total
+
+        return total
+
+    # Chama `purge` em transações separadas até um lote vir incompleto.
+    def _drain(self, engine, purge, cutoff: datetime, batch_size: int) -> int:
+        total = 0
+        while not self._stop.is_set():
+            with engine.begin() as connection:
+                removed = purge(connection, cutoff, batch_size)
+            total += removed
+            if removed < batch_size:
+                break
+            # Pausa entre os lotes para não competir com as requisições.
+            self._stop.wait(self.pause)
+
+        return total
+
+    def start(self, engine):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(engine,), name='purge', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self, engine):
+        # A primeira execução só acontece depois de um intervalo, para não
+        # concorrer com o aquecimento e as primeiras requisições.
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once(engine)
+            except Exception:
+                # Erros (banco indisponível, lock) são tentados de novo no
+                # próximo intervalo.
+                pass
+
+
+purger = Purger()
@@ -0,0 +1,120 @@
+# O repository.py concentra as consultas de usuário usadas pelas rotas e
+# pela autenticação. Cada consulta passa pelo SingleFlight, de modo que
+# requisições concorrentes pedindo o mesmo usuário compartilham um único
+# SELECT no banco de dados.
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from fastapi_dunossauro.models import User
+from fastapi_dunossauro.singleflight import SingleFlight
+
+user_flight = SingleFlight()
+
+# As consultas selecionam as colunas da tabela (e não a entidade User),
+# porque o resultado é compartilhado entre sessões diferentes. Um objeto
+# ORM pertence a uma única sessão, já uma Row é imutável e pode ser
+# reaproveitada por todas as chamadas que aguardaram a consulta.
+_user_columns = select(*User.__table__.c)
+# Usuários excluídos logicamente (deleted_at preenchido) nunca são
+# retornados: para a API, eles já não existem.
+_active_user_columns = _user_columns.where(User.deleted_at.is_(None))
+
+
+def _key(session: Session | AsyncSession, *parts):
+    # A engine faz parte da chave para não misturar bancos diferentes.
+    return (id(session.get_bind()), *parts)
+
+
+def _attach(session: Session, row):
+    if row is None:
+        return None
+
+    # Monta o User a partir da Row e o anexa à sessão de quem chamou sem
+    # emitir outro SELECT (merge com load=False).
+    user = User.__mapper__.class_manager.new_instance()
+    for column, value in row._mapping.items():
+        setattr(user, column, value)
+    make_transient_to_detached(user)
+
+    return session.merge(user, load=False)
+
+
+# Os e-mails são gravados em minúsculas, então a busca normaliza o valor
+# recebido e compara direto com a coluna, usando o índice único de email.
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def get_user_by_email(session: Session, email: str):
+    email = normalize_email(email)
+    stmt = _active_user_columns.where(User.email == email)
+    row = user_flight.do(
+        _key(session, 'email', email),
+        lambda: session.execute(stmt).first(),
+    )
+    return _attach(session, row)
+
+
+def get_user_by_id(session: Session, user_id: int):
+    stmt = _active_user_columns.where(User.id == user_id)
+    row = user_flight.do(
+        _key(session, 'id', user_id),
+        lambda: session.execute(stmt).first(),
+    )
+    return _attach(session, row)
+
+
+# Monta a consulta paginada de read_users. Cada ordenação tem um índice
+# próprio e o id entra como desempate, o que mantém a ordem estável entre
+# páginas e ainda é atendido pelo índice (que já termina no id/rowid).
+def users_page_query(filter_users):
+    # O filtro deleted_at IS NULL permite usar os índices parciais de
+    # created_at e updated_at, que só contêm os usuários ativos.
+    query = select(User).where(User.deleted_at.is_(None))
+
+    # O prefixo vira um intervalo de username (>= 'mel' e < 'mel' seguido do
+    # maior caractere Unicode) ao invés de LIKE 'mel%', que no SQLite não
+    # usa o índice por padrão.
+    if filter_users.username_prefix:
+        prefix = filter_users.username_prefix
+        query = query.where(
+            User.username >= prefix, User.username < prefix + '\U0010ffff'
+        )
+
+    if filter_users.created_after:
+        query = query.where(User.created_at > filter_users.created_after)
+
+    column = getattr(User, filter_users.order_by)
+    if filter_users.direction == 'desc':
+        query = query.order_by(column.desc(), User.id.desc())
+    else:
+        query = query.order_by(column, User.id)
+
+    return query.offset(filter_users.offset).limit(filter_users.limit)
+
+
+# Versões assíncronas, para uso com a engine async do SQLAlchemy.
+async def _fetch_first(session: AsyncSession, stmt):
+    result = await session.execute(stmt)
+    return result.first()
+
+
+async def get_user_by_email_async(session: AsyncSession, email: str):
+    email = normalize_email(email)
+    stmt = _active_user_columns.where(User.email == email)
+    row = await user_flight.do_async(
+        _key(session, 'email', email),
+        lambda: _fetch_first(session, stmt),
+    )
+    return await session.run_sync(_attach, row)
+
+
+async def get_user_by_id_async(session: AsyncSession, user_id: int):
+    stmt = _active_user_columns.where(User.id == user_id)
+    row = await user_flight.do_async(
+        _key(session, 'id', user_id),
+        lambda: _fetch_first(session, stmt),
+    )
+    return await session.run_sync(_attach, row)
@@ -0,0 +1,51 @@
+# O request_context.py guarda dados da requisição em andamento em uma
+# ContextVar, para que código fora das rotas (listeners da engine, logs)
+# saiba de qual requisição ele faz parte sem receber o Request como
+# parâmetro. A ContextVar é copiada para o threadpool em que as rotas
+# síncronas rodam, então o valor também é visto por elas.
+
+from contextvars import ContextVar
+
+_request_context: ContextVar[dict | None] = ContextVar(
+    'request_context', default=None
+)
+
+
+def get_request_context() -> dict | None:
+    return _request_context.get()
+
+
+# Rota da requisição atual no formato 'GET /users/{user_id}', ou None fora
+# de uma requisição. O Starlette grava a rota no scope só depois do
+# roteamento, por isso ela é lida aqui, no momento do uso, e não no
+# middleware.
+def current_route() -> str | None:
+    context = _request_context.get()
+    if context is None:
+        return None
+
+    return route_name(context['scope'])
+
+
+def route_name(scope) -> str:
+    route = scope.get('route')
+    path = getattr(route, 'path', scope['path'])
+
+    return f'{scope["method"]} {path}'
+
+
+# Middleware ASGI puro que abre o contexto de cada requisição HTTP.
+class RequestContextMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_context.set({'scope': scope})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_context.reset(token)
@@ -0,0 +1,124 @@
+# O revocation.py controla os tokens revogados (logout) antes de expirarem.
+# Consultar o banco de dados a cada requisição dobraria o custo da
+# autenticação, então cada worker mantém um filtro de Bloom em memória com
+# os jti revogados. O filtro responde "com certeza não revogado" sem ir ao
+# banco (o caso comum) e só os possíveis acertos são confirmados na tabela
+# revoked_tokens, já que o filtro pode ter falsos positivos, mas nunca
+# falsos negativos.
+#
+# O filtro é reconstruído a partir do banco a cada sync_interval segundos,
+# trazendo as revogações feitas por outros workers e descartando as que já
+# expiraram, o que mantém a memória limitada.
+
+import math
+import threading
+from datetime import datetime
+from hashlib import blake2b
+from time import monotonic
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from fastapi_dunossauro.models import RevokedToken, utcnow
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        # Tamanho em bits e quantidade de funções de hash ótimos para a
+        # capacidade e a taxa de falsos positivos desejadas.
+        self.size = max(
+            8, int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.size / 8))
+
+    # Double hashing: as k posições são derivadas de dois hashes de 64 bits.
+    def _positions(self, item: str):
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    def __init__(self, sync_interval: float = 30, capacity: int = 10_000):
+        self.sync_interval = sync_interval
+        self.capacity = capacity
+        self._filter = BloomFilter(capacity)
+        self._last_sync = None
+        self._lock = threading.Lock()
+
+    # Reconstrói o filtro com as revogações ainda válidas no banco.
+    def sync(self, session: Session):
+        jtis = session.scalars(
+            select(RevokedToken.jti).where(RevokedToken.expires_at > utcnow())
+        ).all()
+
+        # Folga para as revogações que chegarem até o próximo sync.
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)))
+        for jti in jtis:
+            bloom.add(jti)
+
+        self._filter = bloom
+        self._last_sync = monotonic()
+
+    def _maybe_sync(self, session: Session):
+        if (
+            self._last_sync is not None
+            and monotonic() - self._last_sync < self.sync_interval
+        ):
+            return
+
+        # Só uma requisição reconstrói o filtro; as demais seguem usando o
+        # filtro atual ao invés de esperar.
+        if self._lock.acquire(blocking=self._last_sync is None):
+            try:
+                self.sync(session)
+            finally:
+                self._lock.release()
+
+    def is_revoked(self, session: Session, jti: str) -> bool:
+        self._maybe_sync(session)
+
+        if jti not in self._filter:
+            return False
+
+        # Possível acerto: confirma no banco (pode ser um falso positivo).
+        return (
+            session.scalar(
+                select(RevokedToken.jti).where(RevokedToken.jti == jti)
+            )
+            is not None
+        )
+
+    def revoke(self, session: Session, jti: str, expires_at: datetime):
+        if expires_at.tzinfo is not None:
+            expires_at = expires_at.astimezone(ZoneInfo('UTC')).replace(
+                tzinfo=None
+            )
+
+        # Aproveita a escrita para remover as revogações já expiradas,
+        # mantendo a tabela do tamanho dos tokens ainda válidos.
+        session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= utcnow())
+        )
+        session.merge(RevokedToken(jti=jti, expires_at=expires_at))
+        session.commit()
+        # O lock garante que a revogação não se perca caso um sync esteja
+        # trocando o filtro neste momento.
+        with self._lock:
+            self._filter.add(jti)
+
+
+revocation_list = RevocationList()
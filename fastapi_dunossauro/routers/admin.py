@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse
+
+from fastapi_dunossauro.profiler import profiler
+from fastapi_dunossauro.schemas import (
+    Message,
+    ProfilerConfig,
+    ProfilerStatus,
+    SlowQueryList,
+)
+from fastapi_dunossauro.security import get_current_admin
+from fastapi_dunossauro.slow_queries import slow_query_log
+
+# Rotas de diagnóstico, restritas aos usuários de ADMIN_EMAILS. Os dados são
+# de cada worker: com vários workers, cada chamada fala com um deles.
+router = APIRouter(
+    prefix='/admin',
+    tags=['admin'],
+    dependencies=[Depends(get_current_admin)],
+)
+
+
+# As consultas mais lentas desde o início do worker, da mais lenta para a
+# mais rápida, com o plano de execução de cada uma.
+@router.get(
+    '/slow-queries', response_model=SlowQueryList, status_code=HTTPStatus.OK
+)
+def read_slow_queries():
+    return {
+        'threshold_ms': slow_query_log.threshold * 1000,
+        'queries': slow_query_log.entries(),
+    }
+
+
+@router.get(
+    '/profiler', response_model=ProfilerStatus, status_code=HTTPStatus.OK
+)
+def read_profiler():
+    return profiler.status()
+
+
+# Liga o profiler (ou altera a configuração, se já estiver ligado).
+@router.put(
+    '/profiler', response_model=ProfilerStatus, status_code=HTTPStatus.OK
+)
+def enable_profiler(config: ProfilerConfig, request: Request):
+    profiler.enable(
+        config.rate,
+        routes=request.app.routes,
+        interval=config.interval_ms / 1000,
+    )
+
+    return profiler.status()
+
+
+@router.delete(
+    '/profiler', response_model=ProfilerStatus, status_code=HTTPStatus.OK
+)
+def disable_profiler():
+    profiler.disable()
+
+    return profiler.status()
+
+
+# Pilhas coletadas no formato collapsed, para gerar o flamegraph com
+# flamegraph.pl ou abrir no speedscope. O filtro route recebe a rota como
+# nas pilhas, ex.: 'POST /users/'.
+@router.get(
+    '/profiler/stacks',
+    response_class=PlainTextResponse,
+    status_code=HTTPStatus.OK,
+)
+def read_profiler_stacks(route: str | None = None):
+    return profiler.collapsed(route)
+
+
+@router.delete(
+    '/profiler/stacks', response_model=Message, status_code=HTTPStatus.OK
+)
+def reset_profiler_stacks():
+    profiler.reset()
+
+    return {'message': 'Amostras do profiler descartadas.'}
@@ -1,20 +1,31 @@
+from datetime import datetime
 from http import HTTPStatus
 from typing import Annotated
+from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from fastapi_dunossauro.audit import audit_log
 from fastapi_dunossauro.database import get_session
 from fastapi_dunossauro.models import User
-from fastapi_dunossauro.schemas import Token
-from fastapi_dunossauro.security import create_access_token, verify_password
+from fastapi_dunossauro.repository import get_user_by_email
+from fastapi_dunossauro.revocation import revocation_list
+from fastapi_dunossauro.schemas import Message, Token
+from fastapi_dunossauro.security import (
+    create_access_token,
+    get_current_user,
+    get_token_payload,
+    verify_password,
+)
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
 Session = Annotated[Session, Depends(get_session)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+TokenPayload = Annotated[dict, Depends(get_token_payload)]
 
 
 # O /token recebe os dados do formulário através do form_data
@@ -32,7 +43,9 @@ def login_for_access_token(
     # OAuth2PasswordRequestForm armazena credendicais do usuário em username.
     # Como usamos email para identifiar o usuário, aqui comparamos username do
     # formulário com o atributo email do modelo User.
-    user = session.scalar(select(User).where(User.email == form_data.username))
+    # get_user_by_email normaliza o e-mail para minúsculas, então o login
+    # aceita 'Melissa@Test.com' com uma única consulta pelo índice.
+    user = get_user_by_email(session, form_data.username)
     # Se o usuário não for encontrado ou a senha não corresponder ao hash
     # armazenado no banco de dados, uma exceção é lançada.
     if not user:
@@ -48,5 +61,27 @@ def login_for_access_token(
         )
 
     access_token = create_access_token(data={'sub': user.email})
+    # O evento vai para a fila do audit e é gravado depois, em lote.
+    audit_log.record('auth.login', user_id=user.id)
 
     return {'access_token': access_token, 'token_type': 'Bearer'}
+
+
+# O /logout revoga o token usado na requisição, que deixa de ser aceito
+# mesmo antes de expirar. A revogação vale até o exp do próprio token.
+@router.post('/logout', response_model=Message, status_code=HTTPStatus.OK)
+def logout(
+    session: Session,
+    current_user: CurrentUser,
+    payload: TokenPayload,
+):
+    # Tokens emitidos antes da inclusão do jti não podem ser revogados
+    # individualmente e simplesmente expiram no tempo normal.
+    if payload.get('jti'):
+        revocation_list.revoke(
+            session,
+            payload['jti'],
+            datetime.fromtimestamp(payload['exp'], tz=ZoneInfo('UTC')),
+        )
+
+    return {'message': 'Token revogado.'}
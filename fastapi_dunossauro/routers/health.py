@@ -0,0 +1,67 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.orm import Session
+
+from fastapi_dunossauro.audit import audit_log
+from fastapi_dunossauro.database import get_session
+from fastapi_dunossauro.schemas import Liveness, PoolStats, Readiness
+from fastapi_dunossauro.warmup import retry_warm_up, warmup_state
+
+# Rotas usadas pelo orquestrador (Kubernetes, load balancer) para saber se o
+# worker está vivo e se já pode receber tráfego.
+router = APIRouter(prefix='/health', tags=['health'])
+
+Session = Annotated[Session, Depends(get_session)]
+
+
+def pool_stats(engine) -> PoolStats:
+    pool = engine.pool
+    stats = PoolStats(pool=type(pool).__name__)
+    # Só o QueuePool (padrão das engines com servidor e arquivo) tem esses
+    # contadores.
+    for field, method in (
+        ('size', 'size'),
+        ('checked_in', 'checkedin'),
+        ('checked_out', 'checkedout'),
+        ('overflow', 'overflow'),
+    ):
+        if callable(getattr(pool, method, None)):
+            setattr(stats, field, getattr(pool, method)())
+
+    return stats
+
+
+# O processo está respondendo. Não consulta o banco, para que uma queda do
+# banco não faça o orquestrador reiniciar todos os workers.
+@router.get('/live', response_model=Liveness, status_code=HTTPStatus.OK)
+def read_liveness():
+    return {'status': 'ok'}
+
+
+# Pronto para receber tráfego só depois do aquecimento do lifespan. Responde
+# 503 antes disso, durante o desligamento e enquanto o aquecimento tiver
+# falhado (degraded), caso em que cada chamada tenta aquecer de novo.
+@router.get('/ready', response_model=Readiness, status_code=HTTPStatus.OK)
+def read_readiness(session: Session, response: Response):
+    if warmup_state.ready and warmup_state.error is not None:
+        retry_warm_up(session)
+
+    if not warmup_state.ready:
+        status = 'starting'
+    elif warmup_state.error is not None:
+        status = 'degraded'
+    else:
+        status = 'ready'
+
+    if status != 'ready':
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+
+    return Readiness(
+        status=status,
+        warmup_seconds=warmup_state.seconds,
+        warmup_error=warmup_state.error,
+        pool=pool_stats(session.get_bind()),
+        audit=audit_log.metrics(),
+    )
@@ -0,0 +1,241 @@
+# Rotas do quadro Kanban. Cada usuário vê e altera apenas os próprios
+# cartões (tasks), e tentativas de acessar cartões de outro usuário
+# recebem 404, como se o cartão não existisse.
+
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from fastapi_dunossauro.database import get_session
+from fastapi_dunossauro.idempotency import IdempotentRoute
+from fastapi_dunossauro.models import Task, TaskState, User
+from fastapi_dunossauro.schemas import (
+    Board,
+    Message,
+    TaskMove,
+    TaskPublic,
+    TaskSchema,
+    TaskUpdate,
+)
+from fastapi_dunossauro.security import get_current_user
+
+router = APIRouter(
+    prefix='/tasks', tags=['tasks'], route_class=IdempotentRoute
+)
+
+CurrentUser = Annotated[User, Depends(get_current_user)]
+Session = Annotated[Session, Depends(get_session)]
+
+# Distância entre cartões vizinhos quando uma coluna é (re)numerada. Cada
+# movimento grava no cartão o ponto médio entre os vizinhos, o que divide a
+# folga por dois; com 1024 cabem dezenas de movimentos seguidos no mesmo
+# lugar antes de a precisão do float acabar.
+GAP = 1024.0
+MIN_GAP = 1e-9
+
+
+def _get_task(session: Session, user: User, task_id: int) -> Task:
+    task = session.scalar(
+        select(Task).where(Task.id == task_id, Task.user_id == user.id)
+    )
+    if not task:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Tarefa não encontrada.'
+        )
+
+    return task
+
+
+# Cartões da mesma coluna do usuário, sem o próprio cartão que se move.
+def _column(user_id: int, state: TaskState, exclude_id: int | None = None):
+    query = select(Task.position).where(
+        Task.user_id == user_id, Task.state == state
+    )
+    if exclude_id is not None:
+        query = query.where(Task.id != exclude_id)
+
+    return query
+
+
+# Posição entre dois vizinhos (None = início ou fim da coluna). Retorna None
+# quando não há mais espaço entre eles e a coluna precisa ser renumerada.
+def position_between(lo: float | None, hi: float | None) -> float | None:
+    if lo is None and hi is None:
+        return GAP
+    if lo is None:
+        return hi - GAP
+    if hi is None:
+        return lo + GAP
+
+    middle = (lo + hi) / 2
+    if hi - lo < MIN_GAP or not lo < middle < hi:
+        return None
+
+    return middle
+
+
+# Posições dos vizinhos do destino. Quando o cliente informa só um dos
+# vizinhos, o outro é o cartão seguinte (ou anterior) na coluna, obtido com
+# uma consulta pelo índice (user_id, state, position).
+def _neighbor_positions(session: Session, user: User, task: Task, move):
+    column = _column(user.id, move.state, exclude_id=task.id)
+    lo = hi = None
+
+    for neighbor_id in (move.after_id, move.before_id):
+        if neighbor_id is None:
+            continue
+        neighbor = _get_task(session, user, neighbor_id)
+        if neighbor.id == task.id or neighbor.state != move.state:
+            raise HTTPException(
+                status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                detail='Vizinho inválido para esta coluna.',
+            )
+        if neighbor_id == move.after_id:
+            lo = neighbor.position
+        else:
+            hi = neighbor.position
+
+    if move.after_id is not None and move.before_id is not None:
+        if lo >= hi:
+            raise HTTPException(
+                status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                detail='Vizinho inválido para esta coluna.',
+            )
+    elif move.after_id is not None:
+        hi = session.scalar(
+            column.where(Task.position > lo).order_by(Task.position).limit(1)
+        )
+    elif move.before_id is not None:
+        lo = session.scalar(
+            column
+            .where(Task.position < hi)
+            .order_by(Task.position.desc())
+            .limit(1)
+        )
+    else:
+        lo = session.scalar(column.order_by(Task.position.desc()).limit(1))
+
+    return lo, hi
+
+
+# Renumera a coluna com folgas de GAP. Só acontece quando a folga entre dois
+# vizinhos se esgota, e é feito em um único executemany.
+def _rebalance(session: Session, user_id: int, state: TaskState):
+    ids = session.scalars(
+        select(Task.id)
+        .where(Task.user_id == user_id, Task.state == state)
+        .order_by(Task.position)
+    ).all()
+    session.execute(
+        update(Task),
+        [
+            {'id': task_id, 'position': (index + 1) * GAP}
+            for index, task_id in enumerate(ids)
+        ],
+    )
+
+
+@router.post('/', response_model=TaskPublic, status_code=HTTPStatus.CREATED)
+def create_task(task: TaskSchema, session: Session, user: CurrentUser):
+    # Novos cartões vão para o fim da coluna.
+    last = session.scalar(
+        _column(user.id, task.state).order_by(Task.position.desc()).limit(1)
+    )
+    db_task = Task(
+        title=task.title,
+        description=task.description,
+        state=task.state,
+        position=position_between(last, None),
+        user_id=user.id,
+    )
+    session.add(db_task)
+    session.commit()
+    session.refresh(db_task)
+
+    return db_task
+
+
+# O quadro inteiro em uma consulta: o índice (user_id, state, position) já
+# entrega as linhas agrupadas por coluna e na ordem, então basta separá-las.
+# Com milhares de cartões, o custo está em montar objetos, e não no banco:
+# por isso são lidas só as colunas da resposta (sem criar objetos ORM) e o
+# Board é validado e serializado uma única vez.
+@router.get('/board', response_model=Board, status_code=HTTPStatus.OK)
+def read_board(session: Session, user: CurrentUser):
+    board = {state.value: [] for state in TaskState}
+    rows = session.execute(
+        select(
+            Task.id, Task.title, Task.description, Task.state, Task.position
+        )
+        .where(Task.user_id == user.id)
+        .order_by(Task.state, Task.position)
+    )
+    for task_id, title, description, state, position in rows:
+        board[state.value].append({
+            'id': task_id,
+            'title': title,
+            'description': description,
+            'state': state,
+            'position': position,
+        })
+
+    return Response(
+        content=Board.model_validate(board).model_dump_json(),
+        media_type='application/json',
+    )
+
+
+@router.patch(
+    '/{task_id}', response_model=TaskPublic, status_code=HTTPStatus.OK
+)
+def update_task(
+    task_id: int, task: TaskUpdate, session: Session, user: CurrentUser
+):
+    db_task = _get_task(session, user, task_id)
+    for key, value in task.model_dump(exclude_unset=True).items():
+        setattr(db_task, key, value)
+
+    session.commit()
+    session.refresh(db_task)
+
+    return db_task
+
+
+# Move o cartão para outra posição (na mesma coluna ou em outra). Só a
+# linha do próprio cartão é alterada, exceto no caso raro de a coluna
+# precisar ser renumerada.
+@router.patch(
+    '/{task_id}/move', response_model=TaskPublic, status_code=HTTPStatus.OK
+)
+def move_task(
+    task_id: int, move: TaskMove, session: Session, user: CurrentUser
+):
+    db_task = _get_task(session, user, task_id)
+
+    lo, hi = _neighbor_positions(session, user, db_task, move)
+    position = position_between(lo, hi)
+    if position is None:
+        _rebalance(session, user.id, move.state)
+        session.expire_all()
+        db_task = _get_task(session, user, task_id)
+        lo, hi = _neighbor_positions(session, user, db_task, move)
+        position = position_between(lo, hi)
+
+    db_task.state = move.state
+    db_task.position = position
+    session.commit()
+    session.refresh(db_task)
+
+    return db_task
+
+
+@router.delete('/{task_id}', response_model=Message, status_code=HTTPStatus.OK)
+def delete_task(task_id: int, session: Session, user: CurrentUser):
+    db_task = _get_task(session, user, task_id)
+    session.delete(db_task)
+    session.commit()
+
+    return {'message': 'Tarefa excluída.'}
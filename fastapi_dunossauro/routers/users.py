@@ -7,30 +7,54 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from fastapi_dunossauro.audit import audit_log
+from fastapi_dunossauro.cache import users_cache
 from fastapi_dunossauro.database import get_session
+from fastapi_dunossauro.events import Broker, format_sse, get_broker
+from fastapi_dunossauro.idempotency import IdempotentRoute
 from fastapi_dunossauro.models import User
+from fastapi_dunossauro.repository import get_user_by_id, users_page_query
 from fastapi_dunossauro.schemas import (
-    FilterPage,
+    FilterUsers,
     Message,
+    SearchUsers,
     UserList,
     UserPublic,
     UserSchema,
 )
+from fastapi_dunossauro.search import (
+    MAX_RANKED_CANDIDATES,
+    search_users_query,
+)
 from fastapi_dunossauro.security import get_current_user, get_password_hash
 
 # O parâmetro prefix ajuda a agrupar todos os endpoints relacionados
 # aos usuários, ou seja, separamos o que é do "domínio" users.
 # O uso da tag 'users' contribui para a organização e
 # documentação automática no swagger.
-router = APIRouter(prefix='/users', tags=['users'])
+# A IdempotentRoute permite que as rotas que alteram dados recebam o header
+# Idempotency-Key, devolvendo a resposta gravada em novas tentativas.
+router = APIRouter(
+    prefix='/users', tags=['users'], route_class=IdempotentRoute
+)
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 Session = Annotated[Session, Depends(get_session)]
+Broker = Annotated[Broker, Depends(get_broker)]
+
+# Intervalo dos comentários de keep-alive do stream de eventos, em segundos.
+SSE_KEEPALIVE = 15
+
+
+# Dados publicados nos eventos de usuário: os mesmos campos da UserPublic.
+def _user_data(user: User) -> dict:
+    return UserPublic.model_validate(user).model_dump(mode='json')
 
 
 # Utiliza-se @router ao invés de @app para definir estas rotas.
@@ -41,7 +65,7 @@ Session = Annotated[Session, Depends(get_session)]
 
 @router.post('/', response_model=UserPublic, status_code=HTTPStatus.CREATED)
 # Nesta rota, o response_model garante os dados e formato da resposta.
-def create_user(user: UserSchema, session: Session):
+def create_user(user: UserSchema, session: Session, broker: Broker):
     # O user: UserSchema garante quais dados e formatos são aceitos
     # na requisição.
     # session... diz que a função get_session será executada antes da execução
@@ -81,9 +105,14 @@ def create_user(user: UserSchema, session: Session):
     )
     session.add(db_user)
     session.commit()
+    users_cache.invalidate()
     session.refresh(db_user)
     # Se passa na validação, novo usuário é criado no banco de dados.
     # Refresh é usado no final para trazer os outros dados do usuário.
+    audit_log.record('user.create', user_id=db_user.id, target_id=db_user.id)
+    broker.publish('user.created', _user_data(db_user))
+    # O evento de auditoria entra em uma fila e é gravado depois, em lote,
+    # sem somar outro INSERT à requisição.
 
     return db_user
 
@@ -92,15 +121,91 @@ def create_user(user: UserSchema, session: Session):
 def read_users(
     session: Session,
     current_user: CurrentUser,
-    filter_users: Annotated[FilterPage, Query()]
+    filter_users: Annotated[FilterUsers, Query()]
 ):
     # offset permite pular um número específico de registros antes de começar
     # a buscar, o que é útil para implementar a navegação por páginas.
     # limit define o número máximo de registros a serem retornados, permitindo
     # que você controle a quantidade de dados enviados em cada resposta.
-    # filter_users invoca o Query Parameters do schema FilterPage.
+    # filter_users invoca o Query Parameters do schema FilterUsers, que além
+    # da paginação aceita ordenação (order_by/direction) e filtros
+    # (username_prefix/created_after).
+    # Páginas já serializadas ficam no users_cache até a próxima escrita na
+    # tabela users, evitando repetir a consulta e a serialização.
+    cache_key = users_cache.key(filter_users)
+    content = users_cache.get(cache_key)
+
+    if content is None:
+        users = session.scalars(users_page_query(filter_users)).all()
+        content = UserList(users=users).model_dump_json().encode()
+        users_cache.set(cache_key, content)
+
+    return Response(content=content, media_type='application/json')
+
+
+# Stream (Server-Sent Events) com as criações, atualizações e exclusões de
+# usuários, para os clientes não precisarem consultar GET /users/
+# repetidamente. Ao reconectar, o navegador envia o header Last-Event-ID e
+# recebe os eventos perdidos. Assim como /search, é declarada antes de
+# /{user_id}.
+@router.get('/events', response_class=StreamingResponse)
+async def stream_user_events(
+    session: Session,
+    current_user: CurrentUser,
+    broker: Broker,
+    last_event_id: Annotated[int | None, Header()] = None,
+):
+    # A autenticação já foi feita; a conexão com o banco é devolvida ao pool
+    # ao invés de ficar presa enquanto o stream estiver aberto.
+    session.close()
+    subscription = broker.subscribe(last_event_id)
+
+    async def stream():
+        try:
+            async for event in subscription.events(SSE_KEEPALIVE):
+                if event is None:
+                    yield ': keep-alive\n\n'
+                else:
+                    yield format_sse(event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+# Descrição da rota na documentação (Swagger), com o limite da ordenação.
+SEARCH_DESCRIPTION = (
+    'Busca usuários por um trecho do username ou do e-mail (q com ao menos '
+    '3 caracteres). No SQLite, só os primeiros '
+    f'{MAX_RANKED_CANDIDATES} acertos (na ordem do id) são ordenados por '
+    'relevância; os acertos seguintes vêm depois deles, sem ordenação por '
+    'relevância, na ordem do id.'
+)
+
+
+# A rota /search precisa ser declarada antes de /{user_id}, senão 'search'
+# seria interpretado como um user_id.
+@router.get(
+    '/search',
+    response_model=UserList,
+    status_code=HTTPStatus.OK,
+    description=SEARCH_DESCRIPTION,
+)
+def search_users(
+    session: Session,
+    current_user: CurrentUser,
+    search: Annotated[SearchUsers, Query()],
+):
+    # Busca por trecho do username ou do e-mail, usando o índice de
+    # trigramas (FTS5 no SQLite, pg_trgm no PostgreSQL). Os resultados vêm
+    # ordenados por relevância (no SQLite, dentro da janela descrita em
+    # SEARCH_DESCRIPTION) e paginados por offset/limit.
     users = session.scalars(
-        select(User).offset(filter_users.offset).limit(filter_users.limit)
+        search_users_query(session, search.q, search.offset, search.limit)
     ).all()
     return {'users': users}
 
@@ -117,7 +222,7 @@ def read_user(
             detail='Você não tem permissão para esta ação.',
         )
 
-    db_user = session.scalar(select(User).where(User.id == user_id))
+    db_user = get_user_by_id(session, user_id)
 
     return db_user
 
@@ -128,6 +233,7 @@ def update_user(
     user: UserSchema,
     session: Session,
     current_user: CurrentUser,
+    broker: Broker,
 ):
     if current_user.id != user_id:
         raise HTTPException(
@@ -142,7 +248,12 @@ def update_user(
         current_user.password = get_password_hash(user.password)
         session.add(current_user)
         session.commit()
+        users_cache.invalidate()
         session.refresh(current_user)
+        audit_log.record(
+            'user.update', user_id=current_user.id, target_id=user_id
+        )
+        broker.publish('user.updated', _user_data(current_user))
 
         return current_user
 
@@ -160,6 +271,7 @@ def delete_user(
     user_id: int,
     session: Session,
     current_user: CurrentUser,
+    broker: Broker,
 ):
     if current_user.id != user_id:
         raise HTTPException(
@@ -171,7 +283,13 @@ def delete_user(
     # usuário logado só tem "visualização" sobre ele próprio, porque qualquer
     # tentativa de atuar em outro usuário só informa que ele não tem permissão
 
-    session.delete(current_user)
+    # Exclusão lógica: só marca o usuário como excluído, um UPDATE de uma
+    # linha. A remoção de fato (e das linhas ligadas a ele) fica para o
+    # purge em segundo plano, em lotes pequenos, fora da requisição.
+    current_user.deleted_at = func.now()
     session.commit()
+    users_cache.invalidate()
+    audit_log.record('user.delete', user_id=user_id, target_id=user_id)
+    broker.publish('user.deleted', {'id': user_id})
 
     return {'message': f'O usuário {user_id} foi excluído do sistema.'}
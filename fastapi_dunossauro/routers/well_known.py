@@ -0,0 +1,18 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Response
+
+from fastapi_dunossauro.schemas import JWKS
+from fastapi_dunossauro.security import get_jwks
+
+# Rotas de descoberta padronizadas em /.well-known.
+router = APIRouter(prefix='/.well-known', tags=['well-known'])
+
+
+# Publica as chaves públicas usadas para assinar os tokens. Os verificadores
+# guardam as chaves em cache pelo kid, e o Cache-Control permite que proxies
+# e clientes HTTP também reaproveitem a resposta.
+@router.get('/jwks.json', response_model=JWKS, status_code=HTTPStatus.OK)
+def read_jwks(response: Response):
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return get_jwks()
@@ -1,4 +1,20 @@
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from datetime import datetime
+from typing import Annotated, Literal
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    field_validator,
+)
+
+from fastapi_dunossauro.models import TaskState
+
+# E-mail normalizado em minúsculas, para que buscas e unicidade não dependam
+# de como o cliente digitou (ex.: 'Melissa@Test.com').
+NormalizedEmail = Annotated[EmailStr, AfterValidator(str.lower)]
 
 
 class Message(BaseModel):
@@ -7,7 +23,7 @@ class Message(BaseModel):
 
 class UserSchema(BaseModel):
     username: str
-    email: EmailStr
+    email: NormalizedEmail
     password: str
 
 
@@ -37,8 +53,142 @@ class Token(BaseModel):
     # token_type mais comum para JWT é "bearer".
 
 
+# Conjunto de chaves públicas (JSON Web Key Set). Cada chave tem campos
+# diferentes conforme o algoritmo, então são mantidas como dicionários.
+class JWKS(BaseModel):
+    keys: list[dict]
+
+
 # Este schema serve para definir os Query Parameters da rota read_users e
 # usando o Field com opção ge impedimos que sejam incluídos valores negativos.
 class FilterPage(BaseModel):
     offset: int = Field(ge=0, default=0)
     limit: int = Field(ge=0, default=15)
+
+
+# Ordenação e filtros da rota read_users. Só são aceitas colunas com índice,
+# para que nenhuma combinação precise ler a tabela inteira.
+class FilterUsers(FilterPage):
+    order_by: Literal['id', 'username', 'created_at', 'updated_at'] = 'id'
+    direction: Literal['asc', 'desc'] = 'asc'
+    username_prefix: str | None = Field(default=None, min_length=1)
+    created_after: datetime | None = None
+
+
+# Parâmetros da busca de usuários: o termo q e a paginação do FilterPage.
+class SearchUsers(FilterPage):
+    q: str = Field(min_length=3)
+
+
+# Estatísticas do pool de conexões expostas pelo /health/ready. Nem todo
+# pool tem tamanho fixo (o StaticPool dos testes, por exemplo), então os
+# contadores podem ser nulos.
+class PoolStats(BaseModel):
+    pool: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+
+
+# Métricas do audit.py: eventos na fila, descartados e gravados, e a
+# latência dos lotes gravados (em milissegundos).
+class AuditMetrics(BaseModel):
+    queued: int
+    dropped: int
+    written: int
+    flushes: int
+    flush_ms_p50: float | None
+    flush_ms_max: float | None
+
+
+class Liveness(BaseModel):
+    status: str
+
+
+class Readiness(BaseModel):
+    status: str
+    warmup_seconds: float | None
+    warmup_error: str | None
+    pool: PoolStats
+    audit: AuditMetrics
+
+
+class TaskSchema(BaseModel):
+    title: str = Field(min_length=1)
+    description: str = ''
+    state: TaskState = TaskState.todo
+
+
+# Campos opcionais: só os enviados são alterados. Enviar null não apaga o
+# campo (as colunas são NOT NULL), então é recusado com 422.
+class TaskUpdate(BaseModel):
+    title: str | None = Field(default=None, min_length=1)
+    description: str | None = None
+
+    # Só roda para os campos enviados: o default None não é validado.
+    @field_validator('title', 'description')
+    @classmethod
+    def reject_null(cls, value):
+        if value is None:
+            raise ValueError('não pode ser nulo')
+        return value
+
+
+class TaskPublic(BaseModel):
+    id: int
+    title: str
+    description: str
+    state: TaskState
+    position: float
+    model_config = ConfigDict(from_attributes=True)
+
+
+# O quadro inteiro, com os cartões de cada coluna já na ordem de position.
+class Board(BaseModel):
+    todo: list[TaskPublic] = []
+    doing: list[TaskPublic] = []
+    done: list[TaskPublic] = []
+
+
+# Destino de um cartão: a coluna e, opcionalmente, os vizinhos entre os
+# quais ele foi solto. after_id é o cartão que fica antes dele e before_id o
+# que fica depois. Sem vizinhos, o cartão vai para o fim da coluna.
+class TaskMove(BaseModel):
+    state: TaskState
+    after_id: int | None = None
+    before_id: int | None = None
+
+
+# Consulta lenta registrada pelo slow_queries.py. params traz só os tipos
+# dos parâmetros, e plan o EXPLAIN capturado na primeira ocorrência.
+class SlowQueryPublic(BaseModel):
+    statement: str
+    params: str
+    route: str | None
+    count: int
+    total_ms: float
+    max_ms: float
+    plan: str | None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SlowQueryList(BaseModel):
+    threshold_ms: float
+    queries: list[SlowQueryPublic]
+
+
+# Configuração do profiler por amostragem: a fração das requisições
+# amostradas e o intervalo entre as leituras das pilhas.
+class ProfilerConfig(BaseModel):
+    rate: float = Field(gt=0, le=1, default=0.01)
+    interval_ms: float = Field(ge=1, le=1000, default=5)
+
+
+class ProfilerStatus(BaseModel):
+    enabled: bool
+    rate: float
+    interval_ms: float
+    requests: int
+    samples: int
+    dropped: int
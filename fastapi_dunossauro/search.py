@@ -0,0 +1,173 @@
+# O search.py implementa a busca de usuários por parte do username ou do
+# e-mail usando um índice de verdade, ao invés de LIKE '%q%', que precisa
+# ler a tabela inteira.
+#
+# No SQLite é usada uma tabela virtual FTS5 com o tokenizer trigram, que
+# indexa todas as sequências de 3 caracteres e por isso encontra qualquer
+# trecho do texto. Ela é de "conteúdo externo" (content='users'): guarda
+# apenas o índice, e os triggers a mantêm sincronizada com a tabela users.
+# No PostgreSQL o equivalente é a extensão pg_trgm com índices GIN, que
+# atendem ILIKE '%q%' e permitem ordenar pela similaridade.
+
+from sqlalchemy import (
+    DDL,
+    case,
+    column,
+    event,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+from sqlalchemy.orm import Session
+
+from fastapi_dunossauro.models import User
+
+# Comandos usados tanto pelo create_all (testes) quanto pela migração.
+SQLITE_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE users_fts USING fts5(
+        username, email, content='users', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER users_fts_insert AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, username, email)
+        VALUES (new.id, new.username, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER users_fts_delete AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER users_fts_update AFTER UPDATE OF username, email
+    ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+        INSERT INTO users_fts(rowid, username, email)
+        VALUES (new.id, new.username, new.email);
+    END
+    """,
+)
+
+POSTGRESQL_TRGM_DDL = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX ix_users_username_trgm ON users '
+    'USING gin (username gin_trgm_ops)',
+    'CREATE INDEX ix_users_email_trgm ON users USING gin (email gin_trgm_ops)',
+)
+
+for dialect, statements in (
+    ('sqlite', SQLITE_FTS_DDL),
+    ('postgresql', POSTGRESQL_TRGM_DDL),
+):
+    for statement in statements:
+        event.listen(
+            User.__table__,
+            'after_create',
+            DDL(statement).execute_if(dialect=dialect),
+        )
+event.listen(
+    User.__table__,
+    'after_drop',
+    DDL('DROP TABLE IF EXISTS users_fts').execute_if(dialect='sqlite'),
+)
+
+users_fts = table('users_fts', column('rowid'), column('rank'))
+
+# Ordenar pelo rank (bm25) todos os acertos de um termo muito comum (ex.:
+# 'silva' com dezenas de milhares de acertos) custa mais que a própria
+# busca. Por isso só os primeiros MAX_RANKED_CANDIDATES acertos, na ordem
+# do id, são ordenados pelo rank; os seguintes vêm depois deles, na ordem
+# do id. A janela não depende do offset, então as páginas são fatias de uma
+# mesma ordenação e não se sobrepõem.
+MAX_RANKED_CANDIDATES = 1000
+MAX_ROWID = 2**63 - 1
+
+
+# A busca vira uma frase do FTS5 (entre aspas), assim caracteres especiais
+# digitados pelo cliente não são interpretados como operadores.
+def _fts_phrase(q: str) -> str:
+    return '"{}"'.format(q.replace('"', '""'))
+
+
+def _fts_matches(q: str):
+    return (
+        select(users_fts.c.rowid)
+        .join(User, User.id == users_fts.c.rowid)
+        .where(
+            literal_column('users_fts').op('MATCH')(_fts_phrase(q)),
+            User.deleted_at.is_(None),
+        )
+    )
+
+
+# rowid do n-ésimo acerto na ordem do id, ou MAX_ROWID se houver menos
+# acertos. O FTS5 entrega os acertos nessa ordem, então a consulta para no
+# n-ésimo, sem calcular o rank.
+def _nth_match(q: str, n: int):
+    return func.coalesce(
+        _fts_matches(q)
+        .order_by(users_fts.c.rowid)
+        .offset(n - 1)
+        .limit(1)
+        .correlate(None)
+        .scalar_subquery(),
+        MAX_ROWID,
+    )
+
+
+def search_users_query(session: Session, q: str, offset: int, limit: int):
+    dialect = session.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # rank é o bm25 do FTS5: quanto menor, mais relevante. A busca no
+        # índice para no último acerto necessário para a página (o fim da
+        # janela ranqueada ou offset + limit, o que for maior), e o rank só
+        # é calculado para os acertos da janela.
+        window_end = _nth_match(q, MAX_RANKED_CANDIDATES)
+        scan_end = (
+            window_end
+            if offset + limit <= MAX_RANKED_CANDIDATES
+            else _nth_match(q, offset + limit)
+        )
+        beyond = (users_fts.c.rowid > window_end).label('beyond')
+        rank = case((~beyond, users_fts.c.rank)).label('rank')
+        candidates = (
+            _fts_matches(q)
+            .add_columns(rank, beyond)
+            .where(users_fts.c.rowid <= scan_end)
+            .order_by(beyond, rank, users_fts.c.rowid)
+            .limit(offset + limit)
+            .subquery('candidates')
+        )
+        query = (
+            select(User)
+            .join(candidates, candidates.c.rowid == User.id)
+            .order_by(candidates.c.beyond, candidates.c.rank, User.id)
+        )
+    else:
+        pattern = '%{}%'.format(
+            q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        )
+        similarity = func.greatest(
+            func.similarity(User.username, q), func.similarity(User.email, q)
+        )
+        query = (
+            select(User)
+            .where(
+                or_(
+                    User.username.ilike(pattern, escape='\\'),
+                    User.email.ilike(pattern, escape='\\'),
+                ),
+                User.deleted_at.is_(None),
+            )
+            .order_by(similarity.desc(), User.id)
+        )
+
+    return query.offset(offset).limit(limit)
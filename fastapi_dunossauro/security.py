@@ -1,93 +1,155 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from http import HTTPStatus
+from uuid import uuid4
 from zoneinfo import ZoneInfo
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, decode, encode
 from pwdlib import PasswordHash
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from fastapi_dunossauro.database import get_session
-from fastapi_dunossauro.models import User
-from fastapi_dunossauro.settings import Settings
+from fastapi_dunossauro.keys import KeyRing
+from fastapi_dunossauro.repository import get_user_by_email
+from fastapi_dunossauro.request_context import get_request_context
+from fastapi_dunossauro.revocation import revocation_list
+from fastapi_dunossauro.settings import get_settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/token')
+
+
 # Cria um contexto de hash de senhas com a recomendação da pwdlib (o argon2).
-pwd_context = PasswordHash.recommended()
-settings = Settings()
+# Assim como as chaves abaixo, é criado uma única vez, no primeiro uso (ou no
+# lifespan da aplicação), e não no import do módulo.
+@lru_cache
+def get_password_hasher():
+    return PasswordHash.recommended()
+
+
+# Chaves de assinatura/verificação dos tokens (simétrica ou assimétrica).
+@lru_cache
+def get_key_ring():
+    return KeyRing.from_settings(get_settings())
 
 
 # create_access_token cria um novo token JWT para autenticar o usuário.
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
-        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUES
+        minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUES
     )
     # Recebe um dicionário de dados e adiciona o tempo de expiração ao token.
     # Esses dados, em conjunto, formam o payload do JWT.
-    to_encode.update({'exp': expire})
+    # O jti identifica unicamente o token, permitindo revogá-lo no logout.
+    to_encode.update({'exp': expire, 'jti': uuid4().hex})
+    # Com chaves assimétricas, o kid da chave ativa vai no header do token.
+    key_ring = get_key_ring()
+    key, headers = key_ring.signing_key()
     encoded_jwt = encode(
         to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
+        key,
+        algorithm=key_ring.algorithm,
+        headers=headers,
     )
     return encoded_jwt
     # Usa a biblioteca pyjwt para codificar essas informações em um token JWT,
     # que é então retornado.
 
 
+# Chaves públicas no formato JWKS, para outros serviços verificarem tokens.
+def get_jwks():
+    return get_key_ring().jwks()
+
+
 # Cria um hash argon2 para o password.
 def get_password_hash(password: str):
-    return pwd_context.hash(password)
+    return get_password_hasher().hash(password)
 
 
 # Verifica se a plain_password é igual à hashed_password
 # quando aplicado ao contexto do argon2.
 def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_hasher().verify(plain_password, hashed_password)
 
 
-# get_current_user é responsável por extrair o token JWT do
-# header Authorization da requisição, decodificar esse token,
-# extrair as informações do usuário e obter finalmente o usuário
-# do banco de dados. Se qualquer um desses passos falhar,
-# uma exceção será lançada e a requisição será negada.
-def get_current_user(
-    session: Session = Depends(get_session),
-    token: str = Depends(oauth2_scheme)
-    # A injeção de oauth2_scheme garante que um token foi enviado.
-     # Caso não tenha sido enviado, ele redirecionará a tokenUrl
-    # do objeto OAuth2PasswordBearer.
-):
-    # Como essa operação pode apresentar erros em diversos momentos,
-    # foi atribuído um único erro à variável credentials_exception.
-    credentials_exception = HTTPException(
+# Como a validação do token pode apresentar erros em diversos momentos,
+# o erro é montado por credentials_exception. Uma instância nova a cada
+# chamada, porque a exceção levantada guarda o traceback e o contexto da
+# requisição e não pode ser compartilhada entre requisições concorrentes.
+def credentials_exception():
+    return HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Não foi possível validar as credenciais informadas.',
         headers={'WWW-Authenticate': 'Bearer'}
     )
 
+
+# get_token_payload decodifica o token JWT do header Authorization e
+# retorna o payload. Como o FastAPI guarda o resultado das dependências
+# durante a requisição, rotas que dependem dele e de get_current_user
+# (como o logout) decodificam o token uma única vez.
+def get_token_payload(
+    token: str = Depends(oauth2_scheme)
+    # A injeção de oauth2_scheme garante que um token foi enviado.
+    # Caso não tenha sido enviado, ele redirecionará a tokenUrl
+    # do objeto OAuth2PasswordBearer.
+):
+    key_ring = get_key_ring()
     try:
         # Checa, após o decode do token, se o email está presente no subject.
         payload = decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
+            key_ring.verification_key(token),
+            algorithms=[key_ring.algorithm]
         )
-        subject_email = payload.get('sub')
 
-        if not subject_email:
-            raise credentials_exception
+        if not payload.get('sub'):
+            raise credentials_exception()
     # Nessa validação é testada se o token é um token JWT válido.
     except DecodeError:
-        raise credentials_exception
+        raise credentials_exception()
+
+    return payload
+
+
+# get_current_user é responsável por obter o usuário do banco de dados a
+# partir do payload do token. Se o token tiver sido revogado ou o usuário
+# não existir, uma exceção será lançada e a requisição será negada.
+def get_current_user(
+    session: Session = Depends(get_session),
+    payload: dict = Depends(get_token_payload),
+):
+    # A revogação é checada primeiro no filtro em memória; o banco só é
+    # consultado se o jti for um possível acerto.
+    jti = payload.get('jti')
+    if jti and revocation_list.is_revoked(session, jti):
+        raise credentials_exception()
 
-    user = session.scalar(select(User).where(User.email == subject_email))
+    # A consulta passa pelo SingleFlight: requisições simultâneas do mesmo
+    # usuário compartilham um único SELECT.
+    user = get_user_by_email(session, payload['sub'])
 
     # Checa se o e-mail está presente no banco de dados.
     if not user:
-        raise credentials_exception
+        raise credentials_exception()
+
+    # O id do usuário vai para o log de acesso da requisição.
+    context = get_request_context()
+    if context is not None:
+        context['user_id'] = user.id
+
+    return user
+
+
+# get_current_admin libera as rotas de administração apenas para os
+# usuários com e-mail em ADMIN_EMAILS.
+def get_current_admin(user=Depends(get_current_user)):
+    if user.email not in get_settings().ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail='Você não tem permissão para esta ação.',
+        )
 
     return user
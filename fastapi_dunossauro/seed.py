@@ -0,0 +1,185 @@
+# O seed.py popula a tabela users com dados sintéticos para testes de carga
+# (paginação de read_users, login_for_access_token etc.). Criar milhões de
+# usuários pela API ou pelo ORM, um por vez, levaria horas, quase todas
+# gastas no argon2. Aqui as senhas são um conjunto fixo de hashes gerados
+# uma única vez e reaproveitados, e as linhas são inseridas com insert() do
+# Core em executemany, em lotes.
+#
+# A geração das linhas pode ser feita em paralelo (--workers), em processos
+# separados; a inserção fica no processo principal, um lote por transação,
+# o que funciona em qualquer banco, inclusive no SQLite, que aceita um único
+# escritor por vez.
+#
+# No SQLite, o trigger que mantém o índice de busca (users_fts) custaria
+# mais que a própria inserção, linha a linha. Ele é removido durante o seed
+# e o índice é reconstruído de uma vez no final.
+#
+# Uso: python -m fastapi_dunossauro.seed --users 1000000 --workers 4
+# O número n no fim do username (ex.: 'ana_silva42') define a senha do
+# usuário: f'senha{n % passwords}'. O n não é o id da linha, que pode ter
+# saltos (sequências do PostgreSQL, linhas removidas).
+
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from fastapi_dunossauro.models import User, utcnow
+from fastapi_dunossauro.search import SQLITE_FTS_DDL
+from fastapi_dunossauro.security import get_password_hash
+from fastapi_dunossauro.settings import get_settings
+
+FIRST_NAMES = (
+    'ana', 'bruno', 'carla', 'dirce', 'eduardo', 'fernanda', 'gustavo',
+    'helena', 'igor', 'julia', 'leonardo', 'melissa', 'miguel', 'rosa',
+)  # fmt: skip
+LAST_NAMES = (
+    'alves', 'barbosa', 'costa', 'dias', 'ferreira', 'gomes', 'lima',
+    'mendes', 'oliveira', 'pereira', 'rocha', 'santos', 'silva', 'souza',
+)  # fmt: skip
+# As datas de criação são espalhadas pelo último ano, para que as
+# ordenações e filtros por created_at se comportem como em dados reais.
+SPREAD = timedelta(days=365)
+
+
+# Gera as linhas dos usuários [start, stop). Cada lote tem a sua própria
+# semente, então o resultado é o mesmo com qualquer número de workers.
+def generate_chunk(
+    start: int, stop: int, hashes: tuple[str, ...], now: datetime
+) -> list[dict]:
+    rng = random.Random(start)
+    rows = []
+    for n in range(start, stop):
+        name = f'{rng.choice(FIRST_NAMES)}_{rng.choice(LAST_NAMES)}{n}'
+        created_at = now - SPREAD * rng.random()
+        rows.append({
+            'username': name,
+            'email': f'{name}@seed.example.com',
+            'password': hashes[n % len(hashes)],
+            'created_at': created_at,
+            'updated_at': created_at,
+        })
+
+    return rows
+
+
+@contextmanager
+def deferred_fts(engine):
+    if engine.dialect.name != 'sqlite':
+        yield
+        return
+
+    with engine.begin() as connection:
+        connection.execute(text('DROP TRIGGER IF EXISTS users_fts_insert'))
+    try:
+        yield
+    finally:
+        with engine.begin() as connection:
+            # SQLITE_FTS_DDL[1] é o CREATE TRIGGER users_fts_insert.
+            connection.execute(text(SQLITE_FTS_DDL[1]))
+            connection.execute(
+                text("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+            )
+
+
+def seed(
+    engine,
+    users: int,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    passwords: int = 8,
+) -> float:
+    # Hashes argon2 de 'senha0', 'senha1'... calculados uma única vez.
+    hashes = tuple(get_password_hash(f'senha{i}') for i in range(passwords))
+    now = utcnow()
+
+    # Continua a numeração a partir do maior id, para não repetir
+    # username e e-mail ao rodar o seed mais de uma vez. O n só numera os
+    # usernames; o id de cada linha é o que o banco atribuir.
+    with engine.connect() as connection:
+        first = (connection.scalar(select(func.max(User.id))) or 0) + 1
+
+    ranges = [
+        (start, min(start + chunk_size, first + users))
+        for start in range(first, first + users, chunk_size)
+    ]
+
+    start_time = perf_counter()
+    inserted = 0
+
+    def insert_chunks(chunks):
+        nonlocal inserted
+        for rows in chunks:
+            with engine.begin() as connection:
+                connection.execute(insert(User), rows)
+            inserted += len(rows)
+            elapsed = perf_counter() - start_time
+            print(
+                f'{inserted}/{users} usuários '
+                f'({inserted / elapsed:,.0f} linhas/s)',
+                end='\r',
+                flush=True,
+            )
+
+    with deferred_fts(engine):
+        if workers > 1:
+            starts, stops = zip(*ranges)
+            with ProcessPoolExecutor(workers) as executor:
+                # O map entrega os lotes na ordem e já gera os próximos
+                # enquanto o processo principal insere os anteriores.
+                insert_chunks(
+                    executor.map(
+                        generate_chunk,
+                        starts,
+                        stops,
+                        [hashes] * len(ranges),
+                        [now] * len(ranges),
+                    )
+                )
+        else:
+            insert_chunks(
+                generate_chunk(start, stop, hashes, now)
+                for start, stop in ranges
+            )
+
+    elapsed = perf_counter() - start_time
+    print()
+    return users / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Popula a tabela users com dados sintéticos.'
+    )
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--passwords', type=int, default=8)
+    parser.add_argument(
+        '--database-url',
+        help='Padrão: DATABASE_URL das configurações da aplicação.',
+    )
+    args = parser.parse_args()
+
+    if args.database_url is None:
+        args.database_url = get_settings().DATABASE_URL
+
+    engine = create_engine(args.database_url)
+    rate = seed(
+        engine,
+        args.users,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        passwords=args.passwords,
+    )
+    engine.dispose()
+
+    print(f'{args.users} usuários inseridos ({rate:,.0f} linhas/s).')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,11 @@
+from functools import lru_cache
+
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from fastapi_dunossauro.keys import SYMMETRIC_ALGORITHMS
+from fastapi_dunossauro.repository import normalize_email
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -10,7 +16,58 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUES: int
+    JWT_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None
+    WARMUP_CONNECTIONS: int = 5
+    SLOW_QUERY_MS: int = 200
+    SLOW_QUERY_TOP: int = 50
+    ADMIN_EMAILS: list[str] = []
+    ACCESS_LOG_RATE: float = 1.0
+    ACCESS_LOG_SAMPLING: dict[str, float] = {}
+    USERS_CACHE_TTL: float = 5
     # A constante DATABASE_URL é o endereço do banco de dados.
     # # A constante SECRET_KEY é usada para assinar o token.
     # O algoritmo HS256 é usado para a codificação.
     # Em produção, a SECRET_KEY fica em local seguro e não exposta no código.
+    # Com ALGORITHM assimétrico (EdDSA ou RS256), JWT_KEYS_DIR é o diretório
+    # com as chaves privadas em PEM (<kid>.pem) e JWT_ACTIVE_KID é o kid da
+    # chave que assina os novos tokens.
+    # WARMUP_CONNECTIONS é quantas conexões do pool são abertas no startup.
+    # Consultas acima de SLOW_QUERY_MS milissegundos entram no registro de
+    # consultas lentas, que guarda as SLOW_QUERY_TOP mais lentas.
+    # ADMIN_EMAILS são os e-mails dos usuários com acesso às rotas /admin.
+    # ACCESS_LOG_RATE é a fração das requisições registradas no log de
+    # acesso, e ACCESS_LOG_SAMPLING a fração por rota, que tem prioridade.
+    # USERS_CACHE_TTL é por quantos segundos uma página de GET /users/ fica
+    # no cache, o atraso máximo com que um worker vê a escrita de outro.
+
+    # Os e-mails dos usuários são gravados em minúsculas, então os de
+    # ADMIN_EMAILS são normalizados do mesmo jeito para a comparação no
+    # get_current_admin (ex.: 'Admin@Exemplo.com').
+    @field_validator('ADMIN_EMAILS')
+    @classmethod
+    def normalize_admin_emails(cls, emails: list[str]) -> list[str]:
+        return [normalize_email(email) for email in emails]
+
+    # Sem esta checagem, um ALGORITHM assimétrico sem JWT_KEYS_DIR só
+    # falharia ao carregar as chaves, com um TypeError sem relação com a
+    # configuração.
+    @model_validator(mode='after')
+    def check_jwt_keys_dir(self):
+        if (
+            self.ALGORITHM not in SYMMETRIC_ALGORITHMS
+            and not self.JWT_KEYS_DIR
+        ):
+            raise ValueError(
+                f'ALGORITHM {self.ALGORITHM!r} é assimétrico e exige '
+                'JWT_KEYS_DIR com as chaves privadas em PEM.'
+            )
+        return self
+
+
+# Settings() lê e valida o .env a cada instância. Com o lru_cache o arquivo
+# é lido uma única vez por processo, na primeira chamada, e todos os
+# módulos compartilham a mesma instância.
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
@@ -0,0 +1,92 @@
+# O SingleFlight agrupa chamadas concorrentes idênticas: enquanto uma
+# consulta para uma chave estiver em andamento, quem pedir a mesma chave
+# aguarda o resultado da primeira chamada (a "líder") ao invés de repetir
+# o mesmo SELECT no banco de dados.
+# Funciona tanto para rotas síncronas (executadas no threadpool do FastAPI)
+# quanto para código assíncrono (engine async do SQLAlchemy).
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    # Representa uma chamada em andamento no modo síncrono.
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._futures: dict[Hashable, asyncio.Future] = {}
+        # deduplicated conta quantas chamadas reaproveitaram o resultado
+        # de outra chamada, ou seja, quantas consultas foram economizadas.
+        self.deduplicated = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.deduplicated += 1
+
+        # As chamadas seguidoras só esperam a líder terminar.
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            # A chave é liberada antes de acordar as seguidoras, assim uma
+            # nova chamada depois deste ponto faz uma consulta nova.
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        # No modo assíncrono tudo roda no mesmo event loop, então não é
+        # preciso lock: entre o get e a atribuição não existe await.
+        future = self._futures.get(key)
+        if future is not None:
+            with self._lock:
+                self.deduplicated += 1
+            # shield evita que o cancelamento de uma seguidora cancele o
+            # resultado compartilhado com as demais.
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Marca a exceção como consumida caso não existam seguidoras,
+            # evitando o aviso "Future exception was never retrieved".
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._futures[key]
+
+        return result
@@ -0,0 +1,205 @@
+# O slow_queries.py registra as consultas que passam de um limite de tempo
+# (SLOW_QUERY_MS), com a rota que as disparou, para descobrir quais
+# comandos das rotas e do get_current_user ficam lentos em produção.
+#
+# Listeners da engine medem cada execução no cursor. Das consultas lentas
+# são guardados o SQL, o formato dos parâmetros (tipos, nunca os valores,
+# que podem ter senhas e e-mails) e as durações. Na primeira vez que um
+# comando aparece como lento, o plano de execução (EXPLAIN no PostgreSQL,
+# EXPLAIN QUERY PLAN no SQLite) é capturado pelo cursor DBAPI, fora dos
+# eventos do SQLAlchemy, e fica guardado junto com ele. Ele roda na conexão
+# e na transação da própria requisição; no PostgreSQL, dentro de um
+# savepoint, porque um erro no EXPLAIN abortaria a transação inteira.
+#
+# A memória é limitada: só os `top` comandos mais lentos são mantidos, e um
+# comando novo só entra no lugar do mais rápido da lista.
+
+import threading
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event
+
+from fastapi_dunossauro.request_context import current_route
+
+# Só comandos que aceitam EXPLAIN sem efeitos colaterais.
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+EXPLAIN_SAVEPOINT = 'slow_query_explain'
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    params: str
+    route: str | None
+    count: int
+    total_ms: float
+    max_ms: float
+    plan: str | None
+
+
+# Formato dos parâmetros, ex.: '(str, int)' ou '{email: str}'. No
+# executemany, o formato da primeira linha e a quantidade de linhas.
+def param_shape(parameters, executemany: bool = False) -> str:
+    if executemany:
+        if not parameters:
+            return '0 x ()'
+        return f'{len(parameters)} x {param_shape(parameters[0])}'
+
+    if isinstance(parameters, dict):
+        items = ', '.join(
+            f'{key}: {type(value).__name__}'
+            for key, value in parameters.items()
+        )
+        return f'{{{items}}}'
+
+    items = ', '.join(type(value).__name__ for value in parameters or ())
+    return f'({items})'
+
+
+def explain(cursor, dialect: str, statement: str, parameters) -> str | None:
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    # No SQLite um erro não desfaz a transação, então o savepoint é
+    # dispensado.
+    savepoint = dialect != 'sqlite'
+    explain_cursor = cursor.connection.cursor()
+    try:
+        if savepoint:
+            explain_cursor.execute(f'SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        try:
+            explain_cursor.execute(prefix + statement, parameters)
+            # A última coluna é o texto do plano nos dois bancos.
+            plan = '\n'.join(str(row[-1]) for row in explain_cursor.fetchall())
+        except Exception as error:  # noqa: BLE001
+            if savepoint:
+                explain_cursor.execute(
+                    f'ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}'
+                )
+            plan = f'EXPLAIN falhou: {error}'
+        if savepoint:
+            explain_cursor.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        return plan
+    except Exception as error:  # noqa: BLE001
+        return f'EXPLAIN falhou: {error}'
+    finally:
+        explain_cursor.close()
+
+
+class SlowQueryLog:
+    def __init__(self, threshold: float = 0.2, top: int = 50):
+        self.threshold = threshold  # Em segundos.
+        self.top = top
+        self._queries: dict[str, SlowQuery] = {}
+        self._lock = threading.Lock()
+
+    def install(self, engine):
+        if not event.contains(engine, 'before_cursor_execute', self._before):
+            event.listen(engine, 'before_cursor_execute', self._before)
+            event.listen(engine, 'after_cursor_execute', self._after)
+
+    def uninstall(self, engine):
+        if event.contains(engine, 'before_cursor_execute', self._before):
+            event.remove(engine, 'before_cursor_execute', self._before)
+            event.remove(engine, 'after_cursor_execute', self._after)
+
+    # O início fica no contexto de execução do comando, que é descartado com
+    # ele, então um comando que termina em erro (sem after_cursor_execute)
+    # não deixa nada para trás na conexão.
+    @staticmethod
+    def _before(  # noqa: PLR0913, PLR0917
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if context is not None:
+            context._slow_query_start = perf_counter()
+
+    def _after(  # noqa: PLR0913, PLR0917
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        start = getattr(context, '_slow_query_start', None)
+        if start is None:
+            # Comando sem contexto, ou listener instalado durante a execução.
+            return
+
+        elapsed = perf_counter() - start
+        if elapsed < self.threshold:
+            return
+
+        self.record(
+            statement,
+            elapsed,
+            param_shape(parameters, executemany),
+            current_route(),
+            lambda: explain(
+                cursor,
+                conn.dialect.name,
+                statement,
+                parameters[0] if executemany else parameters,
+            ),
+        )
+
+    # explain_fn só é chamada para comandos que ainda não estão na lista;
+    # ela roda fora do lock, porque consulta o banco.
+    def record(  # noqa: PLR0913, PLR0917
+        self,
+        statement: str,
+        elapsed: float,
+        params: str,
+        route: str | None,
+        explain_fn=None,
+    ):
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            query = self._queries.get(statement)
+            if query is not None:
+                query.count += 1
+                query.total_ms += elapsed_ms
+                if elapsed_ms > query.max_ms:
+                    query.max_ms = elapsed_ms
+                    query.params = params
+                    query.route = route
+                return
+            if not self._admits(elapsed_ms):
+                return
+
+        plan = explain_fn() if explain_fn else None
+
+        with self._lock:
+            if statement in self._queries or not self._admits(elapsed_ms):
+                return
+            if len(self._queries) >= self.top:
+                fastest = min(self._queries.values(), key=lambda q: q.max_ms)
+                del self._queries[fastest.statement]
+            self._queries[statement] = SlowQuery(
+                statement=statement,
+                params=params,
+                route=route,
+                count=1,
+                total_ms=elapsed_ms,
+                max_ms=elapsed_ms,
+                plan=plan,
+            )
+
+    # Chamado com o lock adquirido.
+    def _admits(self, elapsed_ms: float) -> bool:
+        return len(self._queries) < self.top or elapsed_ms > min(
+            query.max_ms for query in self._queries.values()
+        )
+
+    # Os comandos guardados, do mais lento para o mais rápido.
+    def entries(self) -> list[SlowQuery]:
+        with self._lock:
+            return sorted(
+                (SlowQuery(**vars(query)) for query in self._queries.values()),
+                key=lambda query: query.max_ms,
+                reverse=True,
+            )
+
+    def clear(self):
+        with self._lock:
+            self._queries.clear()
+
+
+slow_query_log = SlowQueryLog()
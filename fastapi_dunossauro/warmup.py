@@ -0,0 +1,99 @@
+# O warmup.py prepara um worker recém-iniciado antes de ele receber
+# tráfego. Sem isso, as primeiras requisições depois de cada deploy pagam
+# pela abertura das conexões com o banco, pela compilação das consultas de
+# usuário pelo SQLAlchemy e pela primeira verificação argon2, o que aparece
+# como picos no p99.
+#
+# O aquecimento roda no lifespan da aplicação e o /health/ready só responde
+# "pronto" depois que ele termina sem erro.
+
+from dataclasses import dataclass
+from functools import lru_cache
+from time import perf_counter
+
+from fastapi_dunossauro.database import session_from_app
+from fastapi_dunossauro.repository import (
+    get_user_by_email,
+    get_user_by_id,
+    users_page_query,
+)
+from fastapi_dunossauro.schemas import FilterUsers
+from fastapi_dunossauro.search import search_users_query
+from fastapi_dunossauro.security import get_password_hash, verify_password
+
+
+@dataclass
+class WarmupState:
+    ready: bool = False
+    seconds: float | None = None
+    error: str | None = None
+
+
+warmup_state = WarmupState()
+
+
+# Abre até `connections` conexões ao mesmo tempo e as devolve ao pool, que
+# as mantém abertas para as próximas requisições. O número é limitado ao
+# tamanho do pool, já que as conexões de overflow seriam fechadas ao voltar.
+def _open_connections(engine, connections: int):
+    size = getattr(engine.pool, 'size', None)
+    if callable(size):
+        connections = min(connections, size())
+
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+# Executa cada consulta de usuário uma vez, com valores que não existem,
+# para preencher o cache de compilação do SQLAlchemy.
+def _prime_queries(session):
+    get_user_by_email(session, 'warmup@warmup.invalid')
+    get_user_by_id(session, 0)
+    session.scalars(users_page_query(FilterUsers())).all()
+    session.scalars(search_users_query(session, 'warmup', 0, 1)).all()
+    session.rollback()
+
+
+# Hash descartável, gerado uma vez por processo.
+@lru_cache
+def _dummy_hash() -> str:
+    return get_password_hash('warmup')
+
+
+def warm_up(app, connections: int):
+    warmup_state.ready = False
+    warmup_state.error = None
+    start = perf_counter()
+
+    # Falhas (o banco ainda indisponível, por exemplo) não impedem o worker
+    # de subir, mas ele fica "degraded" no /health/ready, fora do balanceador,
+    # até que retry_warm_up consiga executar as consultas.
+    try:
+        with session_from_app(app) as session:
+            _open_connections(session.get_bind(), connections)
+            _prime_queries(session)
+    except Exception as exc:
+        warmup_state.error = f'{type(exc).__name__}: {exc}'
+
+    # Inicializa o argon2 (memória, parâmetros) com uma senha descartável.
+    verify_password('warmup', _dummy_hash())
+
+    warmup_state.seconds = perf_counter() - start
+    warmup_state.ready = True
+
+
+# Chamado pelo /health/ready enquanto houver erro: executa as consultas de
+# novo e, se o banco voltou, limpa o erro e o worker passa a ficar pronto.
+def retry_warm_up(session):
+    try:
+        _prime_queries(session)
+    except Exception as exc:
+        session.rollback()
+        warmup_state.error = f'{type(exc).__name__}: {exc}'
+    else:
+        warmup_state.error = None
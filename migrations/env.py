@@ -6,12 +6,12 @@ from sqlalchemy import pool
 from alembic import context
 
 from fastapi_dunossauro.models import table_registry
-from fastapi_dunossauro.settings import Settings
+from fastapi_dunossauro.settings import get_settings
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option('sqlalchemy.url', Settings().DATABASE_URL)
+config.set_main_option('sqlalchemy.url', get_settings().DATABASE_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -24,6 +24,15 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = table_registry.metadata
 
+# A tabela users_fts (FTS5) e os índices de trigramas do PostgreSQL são
+# criados com SQL puro na migração da busca e não existem nos models, então
+# o autogenerate deve ignorá-los ao invés de sugerir removê-los.
+def include_name(name, type_, parent_names):
+    if name and (name.startswith('users_fts') or name.endswith('_trgm')):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +57,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -69,7 +79,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
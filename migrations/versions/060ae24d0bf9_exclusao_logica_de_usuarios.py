@@ -0,0 +1,43 @@
+"""Exclusão lógica de usuários.
+
+Revision ID: 060ae24d0bf9
+Revises: ecd9dfc07397
+Create Date: 2026-10-19 16:40:52.306117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '060ae24d0bf9'
+down_revision: Union[str, Sequence[str], None] = 'ecd9dfc07397'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Os índices parciais (where) não são detectados pelo autogenerate, então
+# os índices de created_at e updated_at são recriados manualmente.
+ACTIVE = sa.text('deleted_at IS NULL')
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.drop_index('ix_users_updated_at', table_name='users')
+    op.drop_index('ix_users_created_at', table_name='users')
+    op.create_index('ix_users_created_at', 'users', ['created_at'], unique=False, sqlite_where=ACTIVE, postgresql_where=ACTIVE)
+    op.create_index('ix_users_updated_at', 'users', ['updated_at'], unique=False, sqlite_where=ACTIVE, postgresql_where=ACTIVE)
+    op.create_index('ix_users_deleted_at', 'users', ['deleted_at'], unique=False, sqlite_where=DELETED, postgresql_where=DELETED)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_deleted_at', table_name='users')
+    op.drop_index('ix_users_updated_at', table_name='users')
+    op.drop_index('ix_users_created_at', table_name='users')
+    op.create_index('ix_users_created_at', 'users', ['created_at'], unique=False)
+    op.create_index('ix_users_updated_at', 'users', ['updated_at'], unique=False)
+    op.drop_column('users', 'deleted_at')
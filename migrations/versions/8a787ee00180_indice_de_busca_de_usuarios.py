@@ -0,0 +1,76 @@
+"""Índice de busca de usuários.
+
+Revision ID: 8a787ee00180
+Revises: 4fa7420ba6bc
+Create Date: 2026-10-19 13:40:18.602571
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a787ee00180'
+down_revision: Union[str, Sequence[str], None] = '4fa7420ba6bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # Tabela FTS5 de conteúdo externo com tokenizer trigram, mantida em
+        # sincronia com users pelos triggers abaixo.
+        op.execute("""
+            CREATE VIRTUAL TABLE users_fts USING fts5(
+                username, email, content='users', content_rowid='id',
+                tokenize='trigram'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER users_fts_insert AFTER INSERT ON users BEGIN
+                INSERT INTO users_fts(rowid, username, email)
+                VALUES (new.id, new.username, new.email);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER users_fts_delete AFTER DELETE ON users BEGIN
+                INSERT INTO users_fts(users_fts, rowid, username, email)
+                VALUES ('delete', old.id, old.username, old.email);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER users_fts_update AFTER UPDATE OF username, email
+            ON users BEGIN
+                INSERT INTO users_fts(users_fts, rowid, username, email)
+                VALUES ('delete', old.id, old.username, old.email);
+                INSERT INTO users_fts(rowid, username, email)
+                VALUES (new.id, new.username, new.email);
+            END
+        """)
+        # Indexa os usuários que já existiam antes da migração.
+        op.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+
+    elif dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('ix_users_username_trgm', 'users', ['username'], postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'})
+        op.create_index('ix_users_email_trgm', 'users', ['email'], postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER users_fts_update')
+        op.execute('DROP TRIGGER users_fts_delete')
+        op.execute('DROP TRIGGER users_fts_insert')
+        op.execute('DROP TABLE users_fts')
+
+    elif dialect == 'postgresql':
+        op.drop_index('ix_users_email_trgm', table_name='users')
+        op.drop_index('ix_users_username_trgm', table_name='users')
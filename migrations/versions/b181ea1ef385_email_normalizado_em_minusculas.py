@@ -0,0 +1,73 @@
+"""E-mail normalizado em minúsculas.
+
+Revision ID: b181ea1ef385
+Revises: 327099f35a61
+Create Date: 2026-10-19 11:21:07.530842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b181ea1ef385'
+down_revision: Union[str, Sequence[str], None] = '327099f35a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Quantidade de linhas atualizadas por vez no backfill, para não gerar um
+# único UPDATE gigante em tabelas grandes.
+BATCH_SIZE = 1000
+
+users = sa.table('users', sa.column('id'), sa.column('email'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    lower_email = sa.func.lower(users.c.email)
+
+    # E-mails que só diferem em maiúsculas/minúsculas não podem ser unidos
+    # automaticamente, então a migração para e lista os casos.
+    duplicated = connection.scalars(
+        sa.select(lower_email)
+        .group_by(lower_email)
+        .having(sa.func.count() > 1)
+    ).all()
+    if duplicated:
+        raise RuntimeError(
+            'E-mails duplicados ignorando maiúsculas: '
+            + ', '.join(duplicated)
+        )
+
+    # Backfill em lotes: percorre a tabela por faixas de id e grava em
+    # minúsculas só os e-mails da faixa que ainda não estão, para que cada
+    # lote leia apenas a sua faixa em vez da tabela inteira.
+    last_id = 0
+    while True:
+        ids = connection.scalars(
+            sa.select(users.c.id)
+            .where(users.c.id > last_id)
+            .order_by(users.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not ids:
+            break
+        connection.execute(
+            users.update()
+            .where(
+                users.c.id.between(ids[0], ids[-1]),
+                users.c.email != lower_email,
+            )
+            .values(email=lower_email)
+        )
+        last_id = ids[-1]
+
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -13,28 +13,45 @@ from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 
 from fastapi_dunossauro.app import app  # Importa o app definido em app.py
+from fastapi_dunossauro.audit import audit_log
+from fastapi_dunossauro.cache import users_cache
 from fastapi_dunossauro.database import get_session
+from fastapi_dunossauro.idempotency import idempotency_store
 from fastapi_dunossauro.models import User, table_registry
+from fastapi_dunossauro.profiler import profiler
 from fastapi_dunossauro.security import get_password_hash
-from fastapi_dunossauro.settings import Settings
+from fastapi_dunossauro.settings import get_settings
+from fastapi_dunossauro.slow_queries import slow_query_log
 
 
 # Uma fixture é como uma função que prepara dados
 # ou estado necessários para o teste.
 @pytest.fixture
-def client(session):
+def client(session, monkeypatch):
     def get_session_override():
         return session
 
     # Função que retorna a fixture session que será usada nos testes.
 
+    app.dependency_overrides[get_session] = get_session_override
+    # Sobrescreve a get_session pela fixture session usada nos testes. A
+    # sobrescrita vem antes do TestClient para que o lifespan (aquecimento)
+    # também use o banco de teste.
+    monkeypatch.setattr(audit_log, 'flush_interval', 3600)
+    monkeypatch.setattr(audit_log, 'batch_size', 10_000)
+    # O banco de teste tem uma única conexão (StaticPool), compartilhada por
+    # todas as threads. Para a thread do audit não gravar no meio de uma
+    # requisição, os eventos só são gravados no desligamento do TestClient.
     with TestClient(app) as client:
-        app.dependency_overrides[get_session] = get_session_override
         yield client
-    # Sobrescreve a get_session pela fixture session usada nos testes.
 
     app.dependency_overrides.clear()
     # Limpa a sobrescrita que fizemos no app para usar a fixture de session.
+    users_cache.clear()
+    idempotency_store.clear()
+    slow_query_log.clear()
+    profiler.reset()
+    # Cada teste usa um banco novo, então os caches em memória são limpos.
 
 
 @pytest.fixture
@@ -147,4 +164,4 @@ def token(client, user):
 # Fixture para usar variáveis de ambiente nos testes.
 @pytest.fixture
 def settings():
-    return Settings()
+    return get_settings()
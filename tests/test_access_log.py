@@ -0,0 +1,80 @@
+import io
+import json
+import logging
+import queue
+
+from fastapi_dunossauro.access_log import (
+    BatchingStreamHandler,
+    JSONFormatter,
+    access_log,
+)
+
+
+# Espera os registros anteriores (como o login da fixture token) e passa a
+# escrever em um buffer.
+def _capture():
+    access_log.queue.join()
+    stream = io.StringIO()
+    access_log.handler.setStream(stream)
+    return stream
+
+
+def _records(stream):
+    access_log.queue.join()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_batching_stream_handler_escrever_quando_a_fila_esvazia():
+    source = queue.Queue()
+    stream = io.StringIO()
+    handler = BatchingStreamHandler(stream, source, capacity=3)
+    handler.setFormatter(JSONFormatter())
+
+    def record(n):
+        return logging.makeLogRecord({'access': {'n': n}})
+
+    # Com registros pendentes na fila, as linhas ficam no lote.
+    source.put('pendente')
+    handler.emit(record(1))
+    handler.emit(record(2))
+    assert not stream.getvalue()
+
+    # O lote cheio é escrito de uma vez.
+    handler.emit(record(3))
+    assert len(stream.getvalue().splitlines()) == 3  # noqa: PLR2004
+
+    # Com a fila vazia, a linha sai na hora.
+    source.get()
+    handler.emit(record(4))
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)['n'] for line in lines] == [1, 2, 3, 4]
+
+
+def test_access_log_registrar_rota_usuario_e_consultas(client, user, token):
+    stream = _capture()
+
+    response = client.get(
+        '/users/', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    [record] = _records(stream)
+    assert record['route'] == 'GET /users/'
+    assert record['path'] == '/users/'
+    assert record['status'] == response.status_code
+    assert record['user_id'] == user.id
+    assert record['db_queries'] >= 1
+    assert record['latency_ms'] > 0
+    assert record['sample_rate'] == 1
+
+
+def test_access_log_respeitar_amostragem_por_rota(client, monkeypatch):
+    stream = _capture()
+    monkeypatch.setattr(access_log, 'rates', {'GET /': 0.0})
+
+    client.get('/')
+    client.get('/pagina-html')
+
+    records = _records(stream)
+    assert [record['route'] for record in records] == ['GET /pagina-html']
+    assert records[0]['user_id'] is None
+    assert records[0]['db_queries'] == 0
@@ -1,5 +1,12 @@
 from http import HTTPStatus
 
+from fastapi.testclient import TestClient
+
+from fastapi_dunossauro.app import app
+from fastapi_dunossauro.database import get_engine, get_session
+from fastapi_dunossauro.security import get_password_hasher
+from fastapi_dunossauro.settings import get_settings
+
 
 def test_read_root_retornar_ok_e_ola_mundao(client):
     # No nome do teste deve ser o que se espera que aconteça.
@@ -31,3 +38,22 @@ def test_read_pagina_html_retornar_ok_e_html(client):
         </body>
     </html>"""
     )
+
+
+def test_get_settings_retornar_mesma_instancia():
+    # O .env é lido uma única vez por processo.
+    assert get_settings() is get_settings()
+
+
+def test_lifespan_criar_engine_e_hasher_antes_da_primeira_requisicao(
+    session,
+):
+    get_engine.cache_clear()
+    get_password_hasher.cache_clear()
+    app.dependency_overrides[get_session] = lambda: session
+
+    with TestClient(app):
+        assert get_engine.cache_info().currsize == 1
+        assert get_password_hasher.cache_info().currsize == 1
+
+    app.dependency_overrides.clear()
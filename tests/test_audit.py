@@ -0,0 +1,99 @@
+from time import monotonic, sleep
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+
+from fastapi_dunossauro.app import app
+from fastapi_dunossauro.audit import AuditLog, audit_log
+from fastapi_dunossauro.database import get_session
+from fastapi_dunossauro.models import AuditEvent, table_registry
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "audit.db"}')
+    table_registry.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _wait_for(condition, timeout=5):
+    deadline = monotonic() + timeout
+    while not condition() and monotonic() < deadline:
+        sleep(0.01)
+
+
+def test_audit_log_gravar_em_lotes_de_batch_size(engine):
+    log = AuditLog(batch_size=3, flush_interval=3600)
+    log.start(engine)
+
+    for user_id in range(7):
+        log.record('user.create', user_id=user_id)
+    _wait_for(lambda: log.written == 6)  # noqa: PLR2004
+
+    # O sétimo evento aguarda o lote completar.
+    assert log.metrics()['flushes'] == 2  # noqa: PLR2004
+    assert log.written == 6  # noqa: PLR2004
+
+    # O que sobrou na fila é gravado no desligamento.
+    log.stop()
+
+    with engine.connect() as connection:
+        user_ids = connection.scalars(
+            select(AuditEvent.user_id).order_by(AuditEvent.id)
+        ).all()
+    assert user_ids == list(range(7))
+    assert log.metrics()['flush_ms_max'] >= 0
+
+
+def test_audit_log_gravar_apos_flush_interval(engine):
+    log = AuditLog(batch_size=100, flush_interval=0.05)
+    log.start(engine)
+
+    log.record('auth.login', user_id=1)
+    _wait_for(lambda: log.written == 1)
+
+    assert log.written == 1
+    log.stop()
+
+
+def test_audit_log_descartar_eventos_com_fila_cheia():
+    log = AuditLog(maxsize=2)
+
+    for _ in range(3):
+        log.record('auth.login', user_id=1)
+
+    assert log.dropped == 1
+    assert log.metrics()['queued'] == 2  # noqa: PLR2004
+
+
+def test_rotas_registrar_eventos_de_auditoria(session, user, monkeypatch):
+    monkeypatch.setattr(audit_log, 'flush_interval', 3600)
+    app.dependency_overrides[get_session] = lambda: session
+
+    with TestClient(app) as client:
+        client.post(
+            '/auth/token',
+            data={'username': user.email, 'password': user.clean_password},
+        )
+        client.post(
+            '/users/',
+            json={
+                'username': 'alice',
+                'email': 'alice@example.com',
+                'password': 'secret',
+            },
+        )
+
+    app.dependency_overrides.clear()
+
+    events = session.execute(
+        select(
+            AuditEvent.action, AuditEvent.user_id, AuditEvent.target_id
+        ).order_by(AuditEvent.id)
+    ).all()
+    assert [tuple(event) for event in events] == [
+        ('auth.login', user.id, None),
+        ('user.create', user.id + 1, user.id + 1),
+    ]
@@ -63,3 +63,13 @@ def test_get_current_user_does_not_exists__exercicio(client):
     assert response.json() == {
         'detail': 'Não foi possível validar as credenciais informadas.'
     }
+
+
+def test_get_token_email_com_maiusculas_retornar_ok(client, user):
+    response = client.post(
+        '/auth/token',
+        data={'username': 'Melissa@Test.com', 'password': user.clean_password}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'access_token' in response.json()
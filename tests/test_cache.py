@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+from fastapi_dunossauro.cache import (
+    LRUBackend,
+    ResponseCache,
+    SharedStoreBackend,
+    users_cache,
+)
+from fastapi_dunossauro.schemas import FilterPage, FilterUsers
+
+
+# Implementação falsa e local de um SharedStore (como um Redis), usada
+# apenas nos testes.
+class FakeSharedStore:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+
+def test_lru_backend_descartar_item_mais_antigo():
+    backend = LRUBackend(maxsize=2)
+    backend.set('a', b'1')
+    backend.set('b', b'2')
+    backend.get('a')  # 'a' passa a ser o item usado mais recentemente.
+    backend.set('c', b'3')
+
+    assert backend.get('a') == b'1'
+    assert backend.get('b') is None
+    assert backend.get('c') == b'3'
+
+
+def test_lru_backend_expirar_item_apos_ttl(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr('fastapi_dunossauro.cache.monotonic', lambda: now)
+    backend = LRUBackend(ttl=5)
+    backend.set('a', b'1')
+
+    now = 104.9
+    assert backend.get('a') == b'1'
+
+    now = 105.0
+    assert backend.get('a') is None
+
+
+def test_response_cache_invalidate_muda_a_chave_das_paginas():
+    cache = ResponseCache(LRUBackend())
+    page = FilterPage(offset=0, limit=10)
+    key = cache.key(page)
+    cache.set(key, b'pagina')
+
+    assert cache.get(cache.key(FilterPage(limit=10))) == b'pagina'
+
+    cache.invalidate()
+
+    assert cache.get(cache.key(page)) is None
+
+
+def test_shared_store_backend_versao_compartilhada_entre_workers():
+    store = FakeSharedStore()
+    worker_a = ResponseCache(SharedStoreBackend(store))
+    worker_b = ResponseCache(SharedStoreBackend(store))
+    page = FilterPage()
+
+    worker_a.set(worker_a.key(page), b'pagina')
+    assert worker_b.get(worker_b.key(page)) == b'pagina'
+
+    worker_b.invalidate()  # Uma escrita no worker B...
+
+    assert worker_a.get(worker_a.key(page)) is None  # ...invalida o A.
+
+
+def test_read_users_servir_pagina_do_cache(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    first = client.get('/users', headers=headers)
+    cache_key = users_cache.key(FilterUsers())
+
+    assert users_cache.get(cache_key) == first.content
+
+    second = client.get('/users', headers=headers)
+
+    assert second.status_code == HTTPStatus.OK
+    assert second.json() == first.json()
+
+
+def test_create_user_invalidar_paginas_em_cache(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/users', headers=headers)
+
+    client.post(
+        '/users',
+        json={
+            'username': 'Dirce',
+            'email': 'dirce@test.com',
+            'password': 'senha_dirce',
+        },
+    )
+    response = client.get('/users', headers=headers)
+
+    assert [u['username'] for u in response.json()['users']] == [
+        'Melissa',
+        'Dirce',
+    ]
@@ -29,5 +29,6 @@ def test_create_user(session, mock_db_time):
         'email': 'miguel@teste.com',
         'created_at': time[0],
         'updated_at': time[1],
+        'deleted_at': None,  # Usuário ativo (não excluído).
         # Usa o time gerado por mock_db_time para validar o campo created_at.
     }
@@ -0,0 +1,184 @@
+import asyncio
+import threading
+from http import HTTPStatus
+
+from fastapi_dunossauro.app import app
+from fastapi_dunossauro.events import (
+    Event,
+    LocalBroker,
+    SharedBroker,
+    get_broker,
+)
+
+
+async def collect(subscription, total):
+    events = []
+    async for event in subscription.events():
+        events.append(event)
+        if len(events) == total:
+            break
+    return events
+
+
+def test_local_broker_entregar_para_todos_os_assinantes():
+    broker = LocalBroker()
+
+    async def main():
+        first, second = broker.subscribe(), broker.subscribe()
+        # As rotas publicam a partir das threads do threadpool.
+        thread = threading.Thread(
+            target=lambda: [
+                broker.publish('user.created', {'id': i}) for i in range(3)
+            ]
+        )
+        thread.start()
+        thread.join()
+        return await asyncio.gather(collect(first, 3), collect(second, 3))
+
+    for events in asyncio.run(main()):
+        assert [event.id for event in events] == [1, 2, 3]
+        assert events[0] == Event(1, 'user.created', {'id': 0})
+
+
+def test_local_broker_descartar_assinante_lento():
+    broker = LocalBroker(queue_size=2)
+
+    async def main():
+        slow = broker.subscribe()
+        for i in range(3):
+            broker.publish('user.updated', {'id': i})
+        await asyncio.sleep(0)
+        # O stream do assinante lento termina sem entregar nada.
+        return [event async for event in slow.events()], slow
+
+    events, slow = asyncio.run(main())
+
+    assert events == []
+    assert slow.dropped
+
+
+def test_local_broker_retomar_a_partir_do_last_event_id():
+    broker = LocalBroker(history=2)
+    for i in range(3):
+        broker.publish('user.created', {'id': i})
+
+    async def main():
+        return (
+            broker.subscribe(last_event_id=1).backlog,
+            broker.subscribe(last_event_id=0).backlog,
+            broker.subscribe(last_event_id=99).backlog,
+        )
+
+    resumed, too_old, from_restart = asyncio.run(main())
+
+    assert [event.id for event in resumed] == [2, 3]
+    # Eventos perdidos fora do buffer (ou de antes de um reinício): o cliente
+    # recebe um reset para recarregar os dados.
+    assert [event.type for event in too_old] == ['reset']
+    assert [event.type for event in from_restart] == ['reset']
+
+
+# Barramento falso, em memória, compartilhado entre brokers que simulam
+# workers diferentes.
+class FakeSharedBus:
+    def __init__(self):
+        self.counters = {}
+        self.callbacks = {}
+
+    def incr(self, key):
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    def publish(self, channel, message):
+        for callback in self.callbacks.get(channel, []):
+            callback(message)
+
+    def subscribe(self, channel, callback):
+        self.callbacks.setdefault(channel, []).append(callback)
+
+
+def test_shared_broker_entregar_eventos_de_outro_worker():
+    bus = FakeSharedBus()
+    worker_a, worker_b = SharedBroker(bus), SharedBroker(bus)
+
+    async def main():
+        subscription = worker_b.subscribe()
+        worker_a.publish('user.deleted', {'id': 7})
+        return await collect(subscription, 1)
+
+    assert asyncio.run(main()) == [Event(1, 'user.deleted', {'id': 7})]
+
+
+# Broker falso para a rota: entrega eventos fixos e termina o stream.
+class FakeBroker:
+    def __init__(self, events=()):
+        self.pending = list(events)
+        self.published = []
+        self.last_event_id = None
+        self.unsubscribed = False
+
+    def publish(self, event_type, data):
+        self.published.append((event_type, data))
+
+    def subscribe(self, last_event_id=None):
+        self.last_event_id = last_event_id
+        return self
+
+    def unsubscribe(self, subscription):
+        self.unsubscribed = True
+
+    async def events(self, keepalive=None):
+        yield None
+        for event in self.pending:
+            yield event
+
+
+def test_stream_user_events_enviar_eventos_sse(client, token):
+    broker = FakeBroker([Event(6, 'user.updated', {'id': 1})])
+    app.dependency_overrides[get_broker] = lambda: broker
+
+    response = client.get(
+        '/users/events',
+        headers={'Authorization': f'Bearer {token}', 'Last-Event-ID': '5'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/event-stream')
+    assert response.text == (
+        ': keep-alive\n\nid: 6\nevent: user.updated\ndata: {"id": 1}\n\n'
+    )
+    assert broker.last_event_id == 5  # noqa: PLR2004
+    assert broker.unsubscribed
+
+
+def test_stream_user_events_exigir_autenticacao(client):
+    response = client.get('/users/events')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_rotas_de_usuario_publicar_eventos(client):
+    broker = FakeBroker()
+    app.dependency_overrides[get_broker] = lambda: broker
+
+    response = client.post(
+        '/users/',
+        json={
+            'username': 'alice',
+            'email': 'alice@example.com',
+            'password': 'secret',
+        },
+    )
+    token = client.post(
+        '/auth/token',
+        data={'username': 'alice@example.com', 'password': 'secret'},
+    ).json()['access_token']
+    user_id = response.json()['id']
+    client.delete(
+        f'/users/{user_id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert broker.published == [
+        ('user.created', response.json()),
+        ('user.deleted', {'id': user_id}),
+    ]
@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from fastapi_dunossauro import warmup
+from fastapi_dunossauro.app import app
+from fastapi_dunossauro.database import get_session
+from fastapi_dunossauro.routers.health import pool_stats
+from fastapi_dunossauro.warmup import warm_up, warmup_state
+
+
+def test_liveness_retornar_ok(client):
+    response = client.get('/health/live')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'status': 'ok'}
+
+
+def test_readiness_retornar_pronto_apos_aquecimento(client):
+    response = client.get('/health/ready')
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['status'] == 'ready'
+    assert data['warmup_error'] is None
+    assert data['warmup_seconds'] >= 0
+    assert data['pool']['pool'] == 'StaticPool'
+
+
+def test_readiness_retornar_service_unavailable_antes_do_aquecimento(
+    client, monkeypatch
+):
+    monkeypatch.setattr(warmup_state, 'ready', False)
+
+    response = client.get('/health/ready')
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json()['status'] == 'starting'
+
+
+def test_readiness_retornar_degraded_apos_aquecimento_com_erro(
+    client, monkeypatch
+):
+    database_down = True
+    prime_queries = warmup._prime_queries
+
+    def flaky_prime_queries(session):
+        if database_down:
+            raise OperationalError('SELECT 1', {}, Exception('banco fora'))
+        prime_queries(session)
+
+    monkeypatch.setattr(warmup_state, 'error', None)
+    monkeypatch.setattr(warmup, '_prime_queries', flaky_prime_queries)
+    warm_up(app, connections=1)
+
+    response = client.get('/health/ready')
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json()['status'] == 'degraded'
+    assert response.json()['warmup_error'].startswith('OperationalError')
+
+    # Com o banco de volta, a próxima chamada aquece de novo e fica pronta.
+    database_down = False
+    response = client.get('/health/ready')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['status'] == 'ready'
+    assert warmup_state.error is None
+
+
+def test_warm_up_abrir_conexoes_do_pool_e_registrar_erro(
+    tmp_path, monkeypatch
+):
+    # Banco sem as tabelas: as consultas falham, mas as conexões ficam
+    # abertas no pool e o erro é registrado para o /health/ready.
+    monkeypatch.setattr(warmup_state, 'error', None)
+    engine = create_engine(f'sqlite:///{tmp_path / "warmup.db"}')
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    warm_up(app, connections=3)
+    app.dependency_overrides.clear()
+
+    assert pool_stats(engine).checked_in == 3  # noqa: PLR2004
+    assert warmup_state.ready
+    assert warmup_state.error.startswith('OperationalError')
+    engine.dispose()
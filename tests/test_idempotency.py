@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from sqlalchemy import func, select
+
+from fastapi_dunossauro import security
+from fastapi_dunossauro.idempotency import TTLStore, idempotency_store
+from fastapi_dunossauro.models import IdempotencyKey, User
+
+NEW_USER = {
+    'username': 'Dirce',
+    'email': 'dirce@test.com',
+    'password': 'senha_dirce',
+}
+
+
+def test_create_user_repetido_com_a_mesma_chave_devolver_resposta_gravada(
+    client, session, monkeypatch
+):
+    headers = {'Idempotency-Key': 'chave-1'}
+    first = client.post('/users/', json=NEW_USER, headers=headers)
+
+    # A rota não pode ser executada de novo (nem o hash da senha).
+    def fail(password):
+        raise AssertionError('A rota foi executada novamente.')
+
+    monkeypatch.setattr(
+        'fastapi_dunossauro.routers.users.get_password_hash', fail
+    )
+    second = client.post('/users/', json=NEW_USER, headers=headers)
+
+    assert first.status_code == second.status_code == HTTPStatus.CREATED
+    assert second.json() == first.json()
+    assert second.headers['Idempotent-Replayed'] == 'true'
+    assert session.scalar(select(func.count()).select_from(User)) == 1
+
+
+def test_chave_reaproveitada_com_outro_corpo_retornar_unprocessable(client):
+    headers = {'Idempotency-Key': 'chave-1'}
+    client.post('/users/', json=NEW_USER, headers=headers)
+
+    response = client.post(
+        '/users/',
+        json={**NEW_USER, 'username': 'Outra'},
+        headers=headers,
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_resposta_gravada_no_banco_sobreviver_ao_cache_local(client, session):
+    headers = {'Idempotency-Key': 'chave-1'}
+    first = client.post('/users/', json=NEW_USER, headers=headers)
+
+    idempotency_store.clear()  # Simula outro worker ou um reinício.
+    second = client.post('/users/', json=NEW_USER, headers=headers)
+
+    assert second.json() == first.json()
+    assert second.headers['Idempotent-Replayed'] == 'true'
+    assert session.scalar(select(func.count()).select_from(IdempotencyKey))
+
+
+def test_conflito_nao_ser_gravado(client, user):
+    headers = {'Idempotency-Key': 'chave-1'}
+    conflicting = {**NEW_USER, 'username': user.username}
+
+    response = client.post('/users/', json=conflicting, headers=headers)
+    retry = client.post('/users/', json=NEW_USER, headers=headers)
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert retry.status_code == HTTPStatus.CREATED
+
+
+def test_update_user_concorrente_com_a_mesma_chave_executar_uma_vez(
+    client, user, token, monkeypatch
+):
+    calls = []
+    original_hash = security.get_password_hash
+
+    def counting_hash(password):
+        calls.append(password)
+        return original_hash(password)
+
+    monkeypatch.setattr(
+        'fastapi_dunossauro.routers.users.get_password_hash', counting_hash
+    )
+    headers = {
+        'Authorization': f'Bearer {token}',
+        'Idempotency-Key': 'chave-1',
+    }
+    payload = {**NEW_USER, 'username': 'Melissa2'}
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        responses = list(
+            executor.map(
+                lambda _: client.put(
+                    f'/users/{user.id}', json=payload, headers=headers
+                ),
+                range(3),
+            )
+        )
+
+    assert {r.status_code for r in responses} == {HTTPStatus.OK}
+    assert len(calls) == 1
+
+
+def test_ttl_store_expirar_e_limitar_tamanho():
+    store = TTLStore(ttl=60, maxsize=2)
+    store.set('a', 'resposta-a')
+    store.set('b', 'resposta-b')
+    store.set('c', 'resposta-c')
+
+    assert store.get('a') is None
+    assert store.get('c') == 'resposta-c'
+
+    expired = TTLStore(ttl=0, maxsize=2)
+    expired.set('a', 'resposta-a')
+
+    assert expired.get('a') is None
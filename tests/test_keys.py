@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+)
+from jwt import decode, encode
+from pydantic import ValidationError
+
+from fastapi_dunossauro import security
+from fastapi_dunossauro.keys import KeyRing, decode_with_jwks, jwks_verifier
+from fastapi_dunossauro.security import create_access_token
+from fastapi_dunossauro.settings import Settings
+
+
+@pytest.fixture
+def ed25519_key_ring(monkeypatch):
+    # Troca a KeyRing da aplicação por uma com duas chaves Ed25519, em que
+    # 'chave-2' é a ativa e 'chave-1' é a anterior, ainda em rotação.
+    key_ring = KeyRing(
+        'EdDSA',
+        private_keys={
+            'chave-1': Ed25519PrivateKey.generate(),
+            'chave-2': Ed25519PrivateKey.generate(),
+        },
+        active_kid='chave-2',
+    )
+    monkeypatch.setattr(security, 'get_key_ring', lambda: key_ring)
+    return key_ring
+
+
+def test_key_ring_chave_ativa_inexistente_levantar_erro():
+    with pytest.raises(ValueError, match='não encontrada'):
+        KeyRing('EdDSA', private_keys={}, active_kid='chave-1')
+
+
+def test_settings_algoritmo_assimetrico_sem_diretorio_levantar_erro():
+    with pytest.raises(ValidationError, match='exige JWT_KEYS_DIR'):
+        Settings(
+            _env_file=None,
+            DATABASE_URL='sqlite://',
+            SECRET_KEY='segredo',
+            ALGORITHM='EdDSA',
+            ACCESS_TOKEN_EXPIRE_MINUES=30,
+            JWT_KEYS_DIR=None,
+        )
+
+
+def test_create_access_token_incluir_kid_da_chave_ativa(ed25519_key_ring):
+    token = create_access_token({'sub': 'test@test.com'})
+    public_key = ed25519_key_ring.public_keys['chave-2']
+
+    decoded = decode(token, public_key, algorithms=['EdDSA'])
+
+    assert decoded['sub'] == 'test@test.com'
+    assert ed25519_key_ring.verification_key(token) is public_key
+
+
+def test_token_da_chave_anterior_continuar_valido(client, user, monkeypatch):
+    old_ring = KeyRing(
+        'EdDSA',
+        private_keys={'chave-1': Ed25519PrivateKey.generate()},
+        active_kid='chave-1',
+    )
+    monkeypatch.setattr(security, 'get_key_ring', lambda: old_ring)
+    token = create_access_token({'sub': user.email})
+
+    # Rotação: uma chave nova passa a assinar e a antiga só verifica.
+    new_ring = KeyRing(
+        'EdDSA',
+        private_keys={
+            **old_ring.private_keys,
+            'chave-2': Ed25519PrivateKey.generate(),
+        },
+        active_kid='chave-2',
+    )
+    monkeypatch.setattr(security, 'get_key_ring', lambda: new_ring)
+    response = client.get(
+        f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_token_de_chave_desconhecida_retornar_unauthorized(
+    client, user, ed25519_key_ring
+):
+    foreign_ring = KeyRing(
+        'EdDSA',
+        private_keys={'chave-x': Ed25519PrivateKey.generate()},
+        active_kid='chave-x',
+    )
+    key, headers = foreign_ring.signing_key()
+    token = encode(
+        {'sub': user.email}, key, algorithm='EdDSA', headers=headers
+    )
+
+    response = client.get(
+        f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_read_jwks_publicar_chaves_publicas(client, ed25519_key_ring):
+    response = client.get('/.well-known/jwks.json')
+    keys = response.json()['keys']
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['Cache-Control'] == 'public, max-age=300'
+    assert {key['kid'] for key in keys} == {'chave-1', 'chave-2'}
+    assert all(key['kty'] == 'OKP' and 'd' not in key for key in keys)
+
+
+def test_read_jwks_algoritmo_simetrico_retornar_lista_vazia(client):
+    response = client.get('/.well-known/jwks.json')
+
+    assert response.json() == {'keys': []}
+
+
+def test_verificador_externo_validar_token_pelo_jwks(
+    client, ed25519_key_ring, monkeypatch
+):
+    verifier = jwks_verifier('http://testserver/.well-known/jwks.json')
+    fetches = []
+
+    def fetch_data():
+        fetches.append(1)
+        return client.get('/.well-known/jwks.json').json()
+
+    monkeypatch.setattr(verifier, 'fetch_data', fetch_data)
+    token = create_access_token({'sub': 'test@test.com'})
+
+    for _ in range(3):
+        decoded = decode_with_jwks(verifier, token, algorithms=['EdDSA'])
+        assert decoded['sub'] == 'test@test.com'
+
+    assert len(fetches) == 1  # As chaves ficaram em cache pelo kid.
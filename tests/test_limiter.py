@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+from fastapi_dunossauro.app import (
+    board_limiter,
+    cheap_limiter,
+    expensive_limiter,
+)
+from fastapi_dunossauro.limiter import (
+    AIMDLimiter,
+    is_board,
+    is_expensive,
+    is_streaming,
+)
+
+
+def test_aimd_limiter_aumentar_limite_com_latencia_baixa():
+    limiter = AIMDLimiter(
+        initial=2, min_limit=1, max_limit=10, latency_target=0.1
+    )
+
+    for _ in range(4):
+        assert limiter.try_acquire()
+        limiter.release(latency=0.01)
+
+    assert limiter.limit > 2  # noqa: PLR2004
+
+
+def test_aimd_limiter_reduzir_limite_com_latencia_alta_ou_erro():
+    limiter = AIMDLimiter(
+        initial=10, min_limit=1, max_limit=10, latency_target=0.1
+    )
+
+    limiter.try_acquire()
+    limiter.release(latency=1.0)
+    assert limiter.limit == 9  # noqa: PLR2004
+
+    limiter.try_acquire()
+    limiter.release(latency=0.01, failed=True)
+    assert limiter.limit == 8.1  # noqa: PLR2004
+
+
+def test_aimd_limiter_recusar_acima_do_limite():
+    limiter = AIMDLimiter(
+        initial=1, min_limit=1, max_limit=1, latency_target=0.1
+    )
+
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.shed == 1
+
+
+def test_is_expensive_separar_rotas_caras_e_baratas():
+    assert is_expensive('POST', '/auth/token')
+    assert is_expensive('POST', '/users/')
+    assert is_expensive('PUT', '/users/1')
+    assert is_expensive('POST', '/tasks/')
+    assert is_expensive('PATCH', '/tasks/1')
+    assert is_expensive('PATCH', '/tasks/1/move')
+    assert is_expensive('DELETE', '/tasks/1')
+    assert not is_expensive('GET', '/users/1')
+    assert not is_expensive('GET', '/tasks/board')
+    assert not is_expensive('GET', '/')
+
+
+def test_is_board_separar_quadro_de_tarefas():
+    assert is_board('GET', '/tasks/board')
+    assert not is_board('GET', '/tasks/1')
+    assert not is_board('PATCH', '/tasks/1/move')
+
+
+def test_is_streaming_liberar_stream_de_eventos():
+    assert is_streaming('GET', '/users/events')
+    assert not is_streaming('GET', '/users/1')
+
+
+def test_rota_barata_acima_do_limite_retornar_service_unavailable(client):
+    # Ocupa todas as vagas do orçamento barato.
+    slots = int(cheap_limiter.limit)
+    for _ in range(slots):
+        cheap_limiter.try_acquire()
+
+    response = client.get('/')
+
+    for _ in range(slots):
+        cheap_limiter.release(latency=0.0)
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_rota_barata_nao_consumir_orcamento_caro(client):
+    in_flight = expensive_limiter.in_flight
+
+    response = client.get('/')
+
+    assert response.status_code == HTTPStatus.OK
+    assert expensive_limiter.in_flight == in_flight
+
+
+def test_quadro_usar_orcamento_proprio(client, token):
+    # O quadro é recusado quando o seu orçamento está cheio, mesmo com
+    # vagas sobrando no orçamento barato.
+    slots = int(board_limiter.limit)
+    for _ in range(slots):
+        board_limiter.try_acquire()
+
+    board = client.get(
+        '/tasks/board', headers={'Authorization': f'Bearer {token}'}
+    )
+    root = client.get('/')
+
+    for _ in range(slots):
+        board_limiter.release(latency=0.0)
+
+    assert board.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert root.status_code == HTTPStatus.OK
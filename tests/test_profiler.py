@@ -0,0 +1,88 @@
+import sys
+import threading
+from http import HTTPStatus
+
+from fastapi_dunossauro.profiler import SamplingProfiler, profiler
+
+
+def test_sample_atribuir_pilha_ao_frame_da_requisicao():
+    sampler = SamplingProfiler()
+    ready = threading.Event()
+    done = threading.Event()
+
+    def wait_for_sample():
+        ready.set()
+        done.wait(5)
+
+    def request():
+        sampler.begin(sys._getframe(), {'method': 'GET', 'path': '/x'})
+        wait_for_sample()
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    ready.wait(5)
+    sampler.sample()
+    done.set()
+    thread.join()
+
+    [line] = sampler.collapsed().splitlines()
+    assert line.startswith('GET /x;')
+    assert 'wait_for_sample' in line
+    assert line.endswith(' 1')
+    assert sampler.status()['samples'] == 1
+
+
+def test_profiler_desligado_nao_amostrar(client):
+    client.get('/')
+
+    assert profiler.status()['requests'] == 0
+    assert profiler._thread is None
+
+
+def test_profiler_amostrar_create_user(
+    client, user, token, settings, monkeypatch
+):
+    monkeypatch.setattr(settings, 'ADMIN_EMAILS', [user.email])
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.put(
+        '/admin/profiler', json={'rate': 1, 'interval_ms': 1}, headers=headers
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['enabled'] is True
+
+    client.post(
+        '/users/',
+        json={
+            'username': 'alice',
+            'email': 'alice@example.com',
+            'password': 'secret',
+        },
+    )
+    client.delete('/admin/profiler', headers=headers)
+
+    response = client.get(
+        '/admin/profiler/stacks',
+        params={'route': 'POST /users/'},
+        headers=headers,
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    lines = response.text.splitlines()
+    assert lines
+    assert all(line.startswith('POST /users/;') for line in lines)
+    assert any('create_user' in line for line in lines)
+
+    response = client.delete('/admin/profiler/stacks', headers=headers)
+    assert response.json() == {'message': 'Amostras do profiler descartadas.'}
+    assert not profiler.collapsed()
+
+
+def test_profiler_retornar_forbidden_para_nao_admin(client, token):
+    response = client.put(
+        '/admin/profiler',
+        json={'rate': 1},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from fastapi_dunossauro.models import Task, TaskState, User
+from fastapi_dunossauro.purge import Purger, purge_batch, purge_tasks_batch
+
+
+def _add_users(session, total, deleted_at=None):
+    users = [
+        User(username=f'user{i}', email=f'user{i}@test.com', password='x')
+        for i in range(total)
+    ]
+    for user in users:
+        user.deleted_at = deleted_at
+    session.add_all(users)
+    session.commit()
+    return users
+
+
+def _usernames(session):
+    session.expire_all()
+    return session.scalars(select(User.username).order_by(User.id)).all()
+
+
+def test_purge_batch_remover_no_maximo_batch_size(session):
+    _add_users(session, 3, deleted_at=datetime(2025, 1, 1))
+
+    removed = purge_batch(session.connection(), datetime(2026, 1, 1), 2)
+    session.commit()
+
+    assert removed == 2  # noqa: PLR2004
+    assert _usernames(session) == ['user2']
+
+
+def test_purger_remover_excluidos_em_lotes(session, user):
+    _add_users(session, 5, deleted_at=datetime(2025, 1, 1))
+    purger = Purger(batch_size=2, pause=0)
+
+    assert purger.run_once(session.get_bind()) == 5  # noqa: PLR2004
+    assert purger.purged == 5  # noqa: PLR2004
+    # Usuários ativos não são tocados.
+    assert _usernames(session) == ['Melissa']
+
+
+def test_purger_respeitar_retention(session):
+    _add_users(session, 2, deleted_at=datetime.now() - timedelta(days=1))
+    purger = Purger(retention=timedelta(days=7))
+
+    assert purger.run_once(session.get_bind()) == 0
+    assert len(_usernames(session)) == 2  # noqa: PLR2004
+
+
+def test_purge_batch_usar_indice_parcial(session):
+    compiled = (
+        select(User.id)
+        .where(
+            User.deleted_at.is_not(None),
+            User.deleted_at <= datetime(2026, 1, 1),
+        )
+        .order_by(User.deleted_at)
+        .compile(session.get_bind())
+    )
+    plan = [
+        row[3]
+        for row in session.connection().exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {compiled}',
+            tuple(compiled.params.values()),
+        )
+    ]
+
+    assert 'ix_users_deleted_at' in plan[0]
+
+
+def _add_tasks(session, owner, total):
+    session.add_all(
+        Task(
+            title=f'{owner.username} {i}',
+            description='',
+            state=TaskState.todo,
+            position=float(i),
+            user_id=owner.id,
+        )
+        for i in range(total)
+    )
+    session.commit()
+
+
+def test_purge_tasks_batch_remover_no_maximo_batch_size(session, user):
+    deleted = _add_users(session, 1, deleted_at=datetime(2025, 1, 1))[0]
+    _add_tasks(session, user, 1)
+    _add_tasks(session, deleted, 3)
+
+    removed = purge_tasks_batch(session.connection(), datetime(2026, 1, 1), 2)
+    session.commit()
+
+    assert removed == 2  # noqa: PLR2004
+    assert session.scalars(select(Task.user_id)).all() == [
+        user.id,
+        deleted.id,
+    ]
+
+
+def test_purge_batch_manter_usuario_com_tarefas(session):
+    deleted = _add_users(session, 1, deleted_at=datetime(2025, 1, 1))[0]
+    _add_tasks(session, deleted, 1)
+
+    removed = purge_batch(session.connection(), datetime(2026, 1, 1), 10)
+    session.commit()
+
+    assert removed == 0
+    assert _usernames(session) == ['user0']
+
+
+def test_purger_remover_tarefas_em_lotes_antes_dos_usuarios(session, user):
+    deleted = _add_users(session, 1, deleted_at=datetime(2025, 1, 1))[0]
+    _add_tasks(session, user, 1)
+    _add_tasks(session, deleted, 5)
+    purger = Purger(task_batch_size=2, pause=0)
+
+    assert purger.run_once(session.get_bind()) == 1
+    assert session.scalars(select(Task.title)).all() == ['Melissa 0']
+    assert _usernames(session) == ['Melissa']
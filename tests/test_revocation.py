@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from jwt import decode
+from sqlalchemy import select
+
+from fastapi_dunossauro.models import RevokedToken
+from fastapi_dunossauro.revocation import BloomFilter, RevocationList
+from fastapi_dunossauro.security import create_access_token
+
+
+def test_bloom_filter_nao_ter_falsos_negativos():
+    bloom = BloomFilter(capacity=1000)
+    items = [f'jti-{i}' for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+
+
+def test_bloom_filter_taxa_de_falsos_positivos_baixa():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f'jti-{i}')
+
+    false_positives = sum(f'outro-{i}' in bloom for i in range(10_000))
+
+    assert false_positives < 300  # noqa: PLR2004
+
+
+def test_create_access_token_incluir_jti(settings):
+    token = create_access_token({'sub': 'test@test.com'})
+    other = create_access_token({'sub': 'test@test.com'})
+
+    decoded = decode(token, settings.SECRET_KEY, algorithms=settings.ALGORITHM)
+
+    assert decoded['jti']
+    assert (
+        decoded['jti']
+        != decode(other, settings.SECRET_KEY, algorithms=settings.ALGORITHM)[
+            'jti'
+        ]
+    )
+
+
+def test_logout_revogar_token(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.post('/auth/logout', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Token revogado.'}
+
+    response = client.get(f'/users/{user.id}', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_logout_nao_revogar_outros_tokens(client, user, token):
+    client.post('/auth/logout', headers={'Authorization': f'Bearer {token}'})
+    other_token = create_access_token({'sub': user.email})
+
+    response = client.get(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {other_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_revocation_list_sync_descartar_revogacoes_expiradas(session):
+    revocations = RevocationList()
+    past = datetime.now() - timedelta(days=1)
+    future = datetime.now() + timedelta(days=1)
+    session.add(RevokedToken(jti='expirado', expires_at=past))
+    session.add(RevokedToken(jti='valido', expires_at=future))
+    session.commit()
+
+    revocations.sync(session)
+
+    assert revocations.is_revoked(session, 'valido')
+    assert not revocations.is_revoked(session, 'expirado')
+
+
+def test_revocation_list_revoke_remover_expiradas_do_banco(session):
+    revocations = RevocationList()
+    past = datetime.now() - timedelta(days=1)
+    session.add(RevokedToken(jti='expirado', expires_at=past))
+    session.commit()
+
+    revocations.revoke(session, 'novo', datetime.now() + timedelta(days=1))
+
+    assert session.scalars(select(RevokedToken.jti)).all() == ['novo']
@@ -0,0 +1,148 @@
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import delete, update
+
+from fastapi_dunossauro import search as search_module
+from fastapi_dunossauro.models import User
+
+
+@pytest.fixture
+def other_users(session):
+    for username in ('carmelo', 'Dirce', 'Melina'):
+        session.add(
+            User(
+                username=username,
+                email=f'{username.lower()}@exemplo.com',
+                password='senha',
+            )
+        )
+    session.commit()
+
+
+def search(client, token, q, **params):
+    return client.get(
+        '/users/search',
+        params={'q': q, **params},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+
+def test_search_users_encontrar_trecho_do_username(
+    client, user, token, other_users
+):
+    response = search(client, token, 'mel')
+
+    assert response.status_code == HTTPStatus.OK
+    assert {u['username'] for u in response.json()['users']} == {
+        'Melissa',
+        'carmelo',
+        'Melina',
+    }
+
+
+def test_search_users_encontrar_trecho_do_email(
+    client, user, token, other_users
+):
+    response = search(client, token, 'exemplo')
+
+    assert {u['username'] for u in response.json()['users']} == {
+        'carmelo',
+        'Dirce',
+        'Melina',
+    }
+
+
+def test_search_users_paginar_resultados(client, user, token, other_users):
+    first = search(client, token, 'mel', limit=2)
+    second = search(client, token, 'mel', limit=2, offset=2)
+
+    first_page = [u['username'] for u in first.json()['users']]
+    second_page = [u['username'] for u in second.json()['users']]
+
+    assert len(first_page) == 2  # noqa: PLR2004
+    assert len(second_page) == 1
+    assert not set(first_page) & set(second_page)
+
+
+def test_search_users_acompanhar_alteracoes(
+    client, session, user, token, other_users
+):
+    # Os triggers mantêm o índice em sincronia com UPDATE e DELETE.
+    session.execute(
+        update(User).where(User.username == 'Dirce').values(username='Rosa')
+    )
+    session.execute(delete(User).where(User.username == 'Melina'))
+    session.commit()
+
+    found = search(client, token, 'mel').json()['users']
+    renamed = search(client, token, 'ros').json()['users']
+
+    assert {u['username'] for u in found} == {'Melissa', 'carmelo'}
+    assert [u['username'] for u in renamed] == ['Rosa']
+
+
+def _add_users(session, usernames, domain='exemplo.com'):
+    session.add_all(
+        User(username=name, email=f'{name}@{domain}', password='senha')
+        for name in usernames
+    )
+    session.flush()
+
+
+def test_search_users_ordenar_janela_por_relevancia(
+    client, session, user, token, monkeypatch
+):
+    monkeypatch.setattr(search_module, 'MAX_RANKED_CANDIDATES', 25)
+    longos = [f'x{i}_joao_da_silva_pereira' for i in range(40)]
+    # Por id: 20 acertos longos, 5 excluídos (que não ocupam lugar na
+    # janela), silva0..4, mais 20 longos e silva5..9. A janela ranqueada
+    # são os 20 primeiros longos e silva0..4.
+    _add_users(session, longos[:20])
+    _add_users(session, [f'silva_{i}' for i in range(5)], domain='s.io')
+    session.execute(
+        update(User)
+        .where(User.username.startswith('silva_', autoescape=True))
+        .values(deleted_at=datetime(2026, 1, 1))
+    )
+    _add_users(session, [f'silva{i}' for i in range(5)])
+    _add_users(session, longos[20:])
+    _add_users(session, [f'silva{i}' for i in range(5, 10)])
+    session.commit()
+
+    pages = [
+        [
+            u['username']
+            for u in search(
+                client, token, 'silva', limit=5, offset=offset
+            ).json()['users']
+        ]
+        for offset in range(0, 50, 5)
+    ]
+    everything = [
+        u['username']
+        for u in search(client, token, 'silva', limit=50).json()['users']
+    ]
+
+    # Dentro da janela, os mais relevantes primeiro.
+    assert pages[0] == [f'silva{i}' for i in range(5)]
+    assert set(sum(pages[1:5], [])) == set(longos[:20])
+    # Depois da janela, a ordem do id.
+    assert sum(pages[5:], []) == longos[20:] + [
+        f'silva{i}' for i in range(5, 10)
+    ]
+    # As páginas são fatias da mesma ordenação.
+    assert sum(pages, []) == everything
+
+
+def test_search_users_aspas_nao_quebrar_a_busca(client, user, token):
+    response = search(client, token, '"mel')
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_search_users_termo_curto_retornar_unprocessable(client, token):
+    response = search(client, token, 'me')
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,58 @@
+import re
+from datetime import datetime
+
+from sqlalchemy import func, select, text
+
+from fastapi_dunossauro.models import User
+from fastapi_dunossauro.search import search_users_query
+from fastapi_dunossauro.security import verify_password
+from fastapi_dunossauro.seed import generate_chunk, seed
+
+
+def test_generate_chunk_ser_deterministico():
+    hashes = ('h0', 'h1')
+    now = datetime(2026, 1, 1)
+
+    assert generate_chunk(1, 5, hashes, now) == generate_chunk(
+        1, 5, hashes, now
+    )
+    assert [row['password'] for row in generate_chunk(1, 5, hashes, now)] == [
+        'h1', 'h0', 'h1', 'h0',
+    ]  # fmt: skip
+
+
+def test_seed_inserir_usuarios_em_lotes(session, user):
+    engine = session.get_bind()
+
+    seed(engine, 25, chunk_size=10, passwords=2)
+
+    total = session.scalar(select(func.count()).select_from(User))
+    assert total == 26  # noqa: PLR2004
+    seeded = session.scalars(select(User).where(User.id > user.id)).all()
+    assert len({u.username for u in seeded}) == 25  # noqa: PLR2004
+    assert len({u.password for u in seeded}) == 2  # noqa: PLR2004
+    # A senha segue o número no fim do username, e não o id.
+    for seeded_user in seeded[:2]:
+        n = int(re.search(r'\d+$', seeded_user.username).group())
+        assert verify_password(f'senha{n % 2}', seeded_user.password)
+
+
+def test_seed_manter_a_busca_atualizada(session, user):
+    engine = session.get_bind()
+
+    seed(engine, 5, passwords=1)
+    last = session.scalar(select(User).order_by(User.id.desc()).limit(1))
+    session.add(User(username='depois', email='d@test.com', password='x'))
+    session.commit()
+
+    # O trigger foi recriado e o índice reconstruído com as linhas do seed.
+    trigger = text(
+        "SELECT count(*) FROM sqlite_master WHERE name = 'users_fts_insert'"
+    )
+    assert session.scalar(trigger) == 1
+    found = session.scalars(
+        search_users_query(session, last.username, 0, 10)
+    ).all()
+    assert [u.id for u in found] == [last.id]
+    found = session.scalars(search_users_query(session, 'depois', 0, 10)).all()
+    assert [u.username for u in found] == ['depois']
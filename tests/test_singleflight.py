@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from fastapi_dunossauro.models import User, table_registry
+from fastapi_dunossauro.repository import (
+    get_user_by_email,
+    get_user_by_email_async,
+    get_user_by_id,
+    get_user_by_id_async,
+)
+from fastapi_dunossauro.singleflight import SingleFlight
+
+
+def test_do_chamadas_concorrentes_compartilham_uma_execucao():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_query():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)  # Simula um SELECT demorado.
+        return 'resultado'
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        leader = executor.submit(flight.do, 'user:1', slow_query)
+        started.wait()
+        followers = [
+            executor.submit(flight.do, 'user:1', slow_query) for _ in range(4)
+        ]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == ['resultado'] * 5
+    assert len(calls) == 1
+    assert flight.deduplicated == 4  # noqa: PLR2004
+
+
+def test_do_chamadas_sequenciais_nao_sao_deduplicadas():
+    flight = SingleFlight()
+
+    assert flight.do('user:1', lambda: 1) == 1
+    assert flight.do('user:1', lambda: 2) == 2  # noqa: PLR2004
+    assert flight.deduplicated == 0
+
+
+def test_do_erro_da_lider_propagado_para_seguidoras():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing_query():
+        started.set()
+        time.sleep(0.2)
+        raise RuntimeError('falhou')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, 'user:1', failing_query)
+        started.wait()
+        follower = executor.submit(flight.do, 'user:1', failing_query)
+
+        with pytest.raises(RuntimeError):
+            leader.result()
+        with pytest.raises(RuntimeError):
+            follower.result()
+
+
+def test_do_async_chamadas_concorrentes_compartilham_uma_execucao():
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_query():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'resultado'
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do_async('user:1', slow_query) for _ in range(5))
+        )
+
+    results = asyncio.run(main())
+
+    assert results == ['resultado'] * 5
+    assert len(calls) == 1
+    assert flight.deduplicated == 4  # noqa: PLR2004
+
+
+def test_get_user_by_email_retornar_usuario_da_sessao(session, user):
+    db_user = get_user_by_email(session, user.email)
+
+    assert db_user is user  # O objeto já existente no identity map.
+
+
+def test_get_user_by_id_inexistente_retornar_none(session):
+    assert get_user_by_id(session, 42) is None
+
+
+def test_get_user_by_email_anexar_usuario_em_outra_sessao(session, user):
+    with Session(session.get_bind()) as other_session:
+        db_user = get_user_by_email(other_session, user.email)
+
+        assert db_user is not user
+        assert db_user in other_session
+        assert db_user.id == user.id
+        assert db_user.username == user.username
+
+
+# Roda `check(engine)` com uma engine async (aiosqlite) em um banco com um
+# usuário. Tudo acontece em um único event loop, do qual as conexões do
+# pool dependem.
+def run_with_async_engine(tmp_path, check):
+    async def main():
+        engine = create_async_engine(
+            f'sqlite+aiosqlite:///{tmp_path / "async.db"}'
+        )
+        async with engine.begin() as connection:
+            await connection.run_sync(table_registry.metadata.create_all)
+            await connection.execute(
+                insert(User).values(
+                    username='Melissa',
+                    email='melissa@test.com',
+                    password='senha',
+                )
+            )
+        try:
+            await check(engine)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_get_user_by_email_async_anexar_usuario_na_sessao(tmp_path):
+    async def check(engine):
+        async with AsyncSession(engine) as session:
+            db_user = await get_user_by_email_async(
+                session, 'Melissa@Test.com'
+            )
+
+            assert db_user in session
+            assert db_user.username == 'Melissa'
+            assert await get_user_by_id_async(session, db_user.id) is db_user
+            assert await get_user_by_id_async(session, 42) is None
+
+    run_with_async_engine(tmp_path, check)
+
+
+def test_get_user_by_id_async_sessoes_concorrentes_compartilham_select(
+    tmp_path,
+):
+    async def check(engine):
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            'before_cursor_execute',
+            lambda *args: statements.append(args[2]),
+        )
+        sessions = [AsyncSession(engine) for _ in range(3)]
+
+        users = await asyncio.gather(
+            *(get_user_by_id_async(session, 1) for session in sessions)
+        )
+
+        # Uma única consulta, e cada sessão recebe o seu próprio objeto.
+        assert len(statements) == 1
+        assert len({id(user) for user in users}) == 3  # noqa: PLR2004
+        for session, user in zip(sessions, users):
+            assert user in session
+            await session.close()
+
+    run_with_async_engine(tmp_path, check)
@@ -0,0 +1,144 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from fastapi_dunossauro.models import User
+from fastapi_dunossauro.settings import Settings
+from fastapi_dunossauro.slow_queries import (
+    EXPLAIN_SAVEPOINT,
+    SlowQueryLog,
+    explain,
+    param_shape,
+    slow_query_log,
+)
+
+
+def test_param_shape_retornar_tipos_sem_valores():
+    assert param_shape(('melissa@test.com', 1)) == '(str, int)'
+    assert param_shape({'email': 'melissa@test.com'}) == '{email: str}'
+    assert param_shape([('a', 1), ('b', 2)], executemany=True) == (
+        '2 x (str, int)'
+    )
+
+
+def test_slow_query_log_manter_somente_as_mais_lentas():
+    log = SlowQueryLog(threshold=0, top=2)
+    explained = []
+
+    def explain_fn():
+        explained.append(1)
+        return 'plano'
+
+    log.record('SELECT 1', 0.3, '()', None, explain_fn)
+    log.record('SELECT 2', 0.1, '()', None, explain_fn)
+    log.record('SELECT 3', 0.2, '()', None, explain_fn)
+    log.record('SELECT 4', 0.05, '()', None, explain_fn)
+    log.record('SELECT 1', 0.5, '()', 'GET /', explain_fn)
+
+    entries = log.entries()
+    assert [q.statement for q in entries] == ['SELECT 1', 'SELECT 3']
+    assert entries[0].count == 2  # noqa: PLR2004
+    assert entries[0].max_ms == 500  # noqa: PLR2004
+    assert entries[0].route == 'GET /'
+    assert entries[0].plan == 'plano'
+    # O EXPLAIN roda uma vez por comando admitido, e não a cada execução.
+    assert len(explained) == 3  # noqa: PLR2004
+
+
+def test_slow_query_log_capturar_explain_do_sqlite(session, user):
+    engine = session.get_bind()
+    log = SlowQueryLog(threshold=0)
+    log.install(engine)
+    log.install(engine)  # Instalar duas vezes não duplica os registros.
+
+    session.scalar(select(User).where(User.email == user.email))
+    log.uninstall(engine)
+    session.scalar(select(User.id).where(User.username == user.username))
+
+    [query] = log.entries()
+    assert 'WHERE users.email = ?' in query.statement
+    assert query.params == '(str)'
+    assert query.count == 1
+    assert query.route is None
+    assert 'USING INDEX' in query.plan
+
+
+def test_slow_query_log_comando_com_erro_nao_deixar_estado(session):
+    engine = session.get_bind()
+    log = SlowQueryLog(threshold=0)
+    log.install(engine)
+    connection = session.connection()
+    info = dict(connection.info)
+
+    with pytest.raises(OperationalError):
+        connection.exec_driver_sql('SELECT * FROM nao_existe')
+    log.uninstall(engine)
+
+    assert connection.info == info
+    assert log.entries() == []
+
+
+def test_explain_com_erro_preservar_a_transacao():
+    # Fora do SQLite o EXPLAIN roda em um savepoint, desfeito se falhar.
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE t (x)')
+    connection.execute('INSERT INTO t VALUES (1)')
+    cursor = connection.cursor()
+
+    plan = explain(cursor, 'postgresql', 'SELECT * FROM nao_existe', ())
+
+    assert plan.startswith('EXPLAIN falhou')
+    assert connection.in_transaction
+    # O savepoint não fica pendurado na transação.
+    with pytest.raises(sqlite3.OperationalError):
+        connection.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+    connection.commit()
+    assert connection.execute('SELECT x FROM t').fetchall() == [(1,)]
+
+
+def test_read_slow_queries_retornar_consultas_com_rota(
+    client, user, token, settings, monkeypatch
+):
+    monkeypatch.setattr(settings, 'ADMIN_EMAILS', [user.email])
+    monkeypatch.setattr(slow_query_log, 'threshold', 0)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.get('/users/', headers=headers)
+    response = client.get('/admin/slow-queries', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['threshold_ms'] == 0
+    routes = {query['route'] for query in data['queries']}
+    assert 'GET /users/' in routes
+    assert user.email not in str(data)
+
+
+def test_read_slow_queries_retornar_forbidden_para_nao_admin(client, token):
+    response = client.get(
+        '/admin/slow-queries', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json() == {
+        'detail': 'Você não tem permissão para esta ação.'
+    }
+
+
+def test_admin_emails_ignorar_maiusculas_da_configuracao(
+    client, user, token, settings, monkeypatch
+):
+    configured = Settings(
+        _env_file=None,
+        **{**settings.model_dump(), 'ADMIN_EMAILS': [user.email.upper()]},
+    )
+    monkeypatch.setattr(settings, 'ADMIN_EMAILS', configured.ADMIN_EMAILS)
+
+    response = client.get(
+        '/admin/slow-queries', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,214 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import select
+
+from fastapi_dunossauro.models import Task, TaskState, User
+from fastapi_dunossauro.routers.tasks import GAP, position_between
+
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def create(client, token, title, state='todo'):
+    response = client.post(
+        '/tasks/',
+        json={'title': title, 'state': state},
+        headers=auth(token),
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    return response.json()
+
+
+def column(client, token, state='todo'):
+    board = client.get('/tasks/board', headers=auth(token)).json()
+    return [task['title'] for task in board[state]]
+
+
+def test_create_task_retornar_created_no_fim_da_coluna(client, token):
+    first = create(client, token, 'a')
+    second = create(client, token, 'b')
+
+    assert first['position'] == GAP
+    assert second['position'] == 2 * GAP
+    assert second['state'] == 'todo'
+
+
+def test_read_board_agrupar_por_coluna_e_ordenar(client, token):
+    create(client, token, 'a')
+    create(client, token, 'b', state='doing')
+    create(client, token, 'c')
+
+    response = client.get('/tasks/board', headers=auth(token))
+
+    assert response.status_code == HTTPStatus.OK
+    board = response.json()
+    assert [t['title'] for t in board['todo']] == ['a', 'c']
+    assert [t['title'] for t in board['doing']] == ['b']
+    assert board['done'] == []
+
+
+def test_move_task_entre_vizinhos_alterar_uma_linha(client, session, token):
+    a, b, c = (create(client, token, title) for title in 'abc')
+
+    response = client.patch(
+        f'/tasks/{c["id"]}/move',
+        json={'state': 'todo', 'after_id': a['id'], 'before_id': b['id']},
+        headers=auth(token),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['position'] == (GAP + 2 * GAP) / 2
+    assert column(client, token) == ['a', 'c', 'b']
+    # Os outros cartões mantêm as posições.
+    positions = session.scalars(select(Task.position).order_by(Task.id)).all()
+    assert positions[:2] == [GAP, 2 * GAP]
+
+
+def test_move_task_com_um_vizinho_e_para_outra_coluna(client, token):
+    a, b, c = (create(client, token, title) for title in 'abc')
+    d = create(client, token, 'd', state='done')
+
+    # Só after_id: o vizinho seguinte é buscado na coluna.
+    client.patch(
+        f'/tasks/{c["id"]}/move',
+        json={'state': 'todo', 'after_id': a['id']},
+        headers=auth(token),
+    )
+    # Só before_id, em outra coluna.
+    client.patch(
+        f'/tasks/{b["id"]}/move',
+        json={'state': 'done', 'before_id': d['id']},
+        headers=auth(token),
+    )
+
+    assert column(client, token) == ['a', 'c']
+    assert column(client, token, 'done') == ['b', 'd']
+
+
+def test_move_task_renumerar_coluna_quando_folga_acaba(client, session, token):
+    a, b, c = (create(client, token, title) for title in 'abc')
+    # Sem espaço entre a e b.
+    session.get(Task, b['id']).position = GAP + 1e-12
+    session.commit()
+
+    response = client.patch(
+        f'/tasks/{c["id"]}/move',
+        json={'state': 'todo', 'after_id': a['id'], 'before_id': b['id']},
+        headers=auth(token),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert column(client, token) == ['a', 'c', 'b']
+    session.expire_all()
+    positions = sorted(session.scalars(select(Task.position)).all())
+    assert positions == [GAP, 1.5 * GAP, 2 * GAP]
+
+
+def test_move_task_retornar_unprocessable_com_vizinho_de_outra_coluna(
+    client, token
+):
+    a = create(client, token, 'a')
+    b = create(client, token, 'b', state='doing')
+
+    response = client.patch(
+        f'/tasks/{a["id"]}/move',
+        json={'state': 'todo', 'after_id': b['id']},
+        headers=auth(token),
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {'detail': 'Vizinho inválido para esta coluna.'}
+
+
+def test_update_task_alterar_campos_enviados(client, token):
+    task = create(client, token, 'a')
+
+    response = client.patch(
+        f'/tasks/{task["id"]}',
+        json={'description': 'detalhes'},
+        headers=auth(token),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['title'] == 'a'
+    assert response.json()['description'] == 'detalhes'
+
+
+@pytest.mark.parametrize('field', ['title', 'description'])
+def test_update_task_com_campo_nulo_retornar_unprocessable(
+    client, token, field
+):
+    task = create(client, token, 'a')
+
+    response = client.patch(
+        f'/tasks/{task["id"]}', json={field: None}, headers=auth(token)
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert column(client, token) == ['a']
+
+
+def test_tasks_de_outro_usuario_retornar_not_found(client, session, token):
+    other = User(username='outro', email='outro@test.com', password='x')
+    session.add(other)
+    session.commit()
+    task = Task(
+        title='alheia',
+        description='',
+        state=TaskState.todo,
+        position=GAP,
+        user_id=other.id,
+    )
+    session.add(task)
+    session.commit()
+
+    response = client.delete(f'/tasks/{task.id}', headers=auth(token))
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Tarefa não encontrada.'}
+    assert column(client, token) == []
+
+
+def test_delete_task_retornar_ok(client, token):
+    task = create(client, token, 'a')
+
+    response = client.delete(f'/tasks/{task["id"]}', headers=auth(token))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Tarefa excluída.'}
+    assert column(client, token) == []
+
+
+@pytest.mark.parametrize(
+    ('lo', 'hi', 'expected'),
+    [
+        (None, None, GAP),
+        (None, GAP, 0.0),
+        (GAP, None, 2 * GAP),
+        (GAP, 2 * GAP, 1.5 * GAP),
+        (1.0, 1.0 + 1e-12, None),
+    ],
+)
+def test_position_between(lo, hi, expected):
+    assert position_between(lo, hi) == expected
+
+
+def test_read_board_usar_indice_sem_ordenacao(session):
+    compiled = (
+        select(Task)
+        .where(Task.user_id == 1)
+        .order_by(Task.state, Task.position)
+        .compile(session.get_bind())
+    )
+    plan = [
+        row[3]
+        for row in session.connection().exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {compiled}',
+            tuple(compiled.params.values()),
+        )
+    ]
+
+    assert 'ix_tasks_user_id_state_position' in plan[0]
+    assert not any('TEMP B-TREE' in step for step in plan)
@@ -1,6 +1,13 @@
+from datetime import datetime
 from http import HTTPStatus
+from itertools import product
 
-from fastapi_dunossauro.schemas import UserPublic
+import pytest
+
+from fastapi_dunossauro.models import User
+from fastapi_dunossauro.repository import users_page_query
+from fastapi_dunossauro.schemas import FilterUsers, UserPublic
+from fastapi_dunossauro.search import search_users_query
 
 
 def test_create_user_retornar_created_e_userpublic(client):
@@ -175,6 +182,30 @@ def test_delete_user_retornar_ok_e_mensagem(client, user, token):
     }
 
 
+def test_delete_user_manter_linha_com_deleted_at(
+    client, session, user, token
+):
+    client.delete(
+        f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    # A linha continua na tabela até o purge, só marcada como excluída.
+    session.expire_all()
+    assert session.get(User, user.id).deleted_at is not None
+
+    # Para a API, o usuário já não existe: o token deixa de valer e ele não
+    # aparece mais na listagem nem na busca.
+    response = client.get(
+        '/users/', headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert session.scalars(users_page_query(FilterUsers())).all() == []
+    assert (
+        session.scalars(search_users_query(session, 'melissa', 0, 10)).all()
+        == []
+    )
+
+
 def test_delete_user_retornar_forbidden_e_mensagem(client, user, token):
     another_user = user.id + 1
     response = client.delete(
@@ -185,3 +216,134 @@ def test_delete_user_retornar_forbidden_e_mensagem(client, user, token):
     assert response.json() == {
         'detail': 'Você não tem permissão para esta ação.'
     }
+
+
+def test_create_user_gravar_email_em_minusculas(client):
+    response = client.post(
+        '/users',
+        json={
+            'username': 'dirce',
+            'email': 'Dirce@Test.com',
+            'password': 'senha',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json()['email'] == 'dirce@test.com'
+
+
+def test_create_user_email_com_maiusculas_retornar_conflict(client, user):
+    response = client.post(
+        '/users',
+        json={
+            'username': 'Leonardo',
+            'email': 'MELISSA@test.com',
+            'password': 'senha_leonardo',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+
+
+@pytest.fixture
+def other_users(session, mock_db_time):
+    # Usuários extras com datas de criação diferentes para os filtros.
+    users = []
+    for username, day in (('Mel', 1), ('Dirce', 10), ('Melina', 20)):
+        with mock_db_time(model=User, created_time=datetime(2025, 11, day)):
+            other = User(
+                username=username,
+                email=f'{username.lower()}@test.com',
+                password='senha',
+            )
+            session.add(other)
+            session.commit()
+        users.append(other)
+
+    return users
+
+
+def test_read_users_ordenar_por_username_desc(
+    client, user, token, other_users
+):
+    response = client.get(
+        '/users/?order_by=username&direction=desc',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert [u['username'] for u in response.json()['users']] == [
+        'Melissa',
+        'Melina',
+        'Mel',
+        'Dirce',
+    ]
+
+
+def test_read_users_filtrar_por_prefixo_e_data(
+    client, user, token, other_users
+):
+    response = client.get(
+        '/users/?username_prefix=Mel&created_after=2025-11-05'
+        '&order_by=created_at',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    # Melissa (fixture user) foi criada agora e Mel antes de 05/11.
+    assert [u['username'] for u in response.json()['users']] == [
+        'Melina',
+        'Melissa',
+    ]
+
+
+def test_read_users_order_by_invalido_retornar_unprocessable(client, token):
+    response = client.get(
+        '/users/?order_by=password',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+# Confere, com EXPLAIN QUERY PLAN do SQLite, que toda combinação de ordenação
+# e filtros usa um índice: ou busca (SEARCH) pelo índice do filtro, ou
+# percorre um índice já na ordem pedida (parando no LIMIT). Ordenar por id
+# percorre a própria tabela, que no SQLite é a árvore da chave primária.
+@pytest.mark.parametrize(
+    ('order_by', 'direction', 'username_prefix', 'created_after'),
+    list(
+        product(
+            ['id', 'username', 'created_at', 'updated_at'],
+            ['asc', 'desc'],
+            [None, 'mel'],
+            [None, datetime(2025, 11, 5)],
+        )
+    ),
+)
+def test_users_page_query_usar_indice(
+    session, order_by, direction, username_prefix, created_after
+):
+    filter_users = FilterUsers(
+        order_by=order_by,
+        direction=direction,
+        username_prefix=username_prefix,
+        created_after=created_after,
+    )
+    compiled = users_page_query(filter_users).compile(session.get_bind())
+    plan = [
+        row[3]
+        for row in session.connection().exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {compiled}',
+            tuple(compiled.params.values()),
+        )
+    ]
+    access = plan[0]
+    sorts = any('TEMP B-TREE' in step for step in plan)
+
+    if access.startswith('SEARCH'):
+        assert 'USING' in access
+    elif order_by == 'id':
+        assert access == 'SCAN users'
+        assert not sorts
+    else:
+        assert 'USING INDEX' in access or 'USING COVERING INDEX' in access
+        assert not sorts